@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Optional
 
 @dataclass
@@ -43,3 +44,14 @@ class Sign:
             raise ValueError("El nombre del signo es obligatorio")
         if not self.user_id:
             raise ValueError("El ID del usuario es obligatorio")
+
+@dataclass
+class RevokedToken:
+    """Entidad de dominio para un token JWT revocado (logout)"""
+    id: Optional[int]
+    jti: str  # Identificador único del token (claim 'jti')
+    expires_at: datetime  # Expiración del token; después de esta fecha el registro ya no es necesario
+
+    def __post_init__(self):
+        if not self.jti:
+            raise ValueError("El jti del token es obligatorio")
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
-from .entities import User, UserCredentials, Sign
+from typing import List, Optional, Dict, Any, Tuple, Iterator
+from datetime import datetime
+from .entities import User, UserCredentials, Sign, RevokedToken
 
 class UserRepository(ABC):
     """Interfaz abstracta para el repositorio de usuarios"""
@@ -10,9 +11,19 @@ class UserRepository(ABC):
         """Crea un nuevo usuario"""
         pass
 
+    @abstractmethod
+    def create_many(self, users: List[User]) -> List[User]:
+        """Crea varios usuarios con inserciones en lote (mismo orden de entrada)"""
+        pass
+
     @abstractmethod
     def get_by_email(self, email: str) -> Optional[User]:
-        """Obtiene un usuario por email"""
+        """Obtiene un usuario por email (sin distinguir mayúsculas)"""
+        pass
+
+    @abstractmethod
+    def get_by_emails(self, emails: List[str]) -> List[User]:
+        """Obtiene los usuarios activos cuyos emails estén en la lista, sin distinguir mayúsculas (una sola consulta)"""
         pass
 
     @abstractmethod
@@ -28,6 +39,11 @@ class UserCredentialsRepository(ABC):
         """Crea nuevas credenciales de usuario"""
         pass
 
+    @abstractmethod
+    def create_many(self, credentials: List[UserCredentials]) -> List[UserCredentials]:
+        """Crea varias credenciales con inserciones en lote (mismo orden de entrada)"""
+        pass
+
     @abstractmethod
     def get_by_username(self, username: str) -> Optional[UserCredentials]:
         """Obtiene credenciales por username"""
@@ -46,6 +62,11 @@ class SignRepository(ABC):
         """Crea un nuevo signo"""
         pass
 
+    @abstractmethod
+    def create_many(self, signs: List[Sign]) -> List[Sign]:
+        """Crea varios signos con inserciones en lote (mismo orden de entrada)"""
+        pass
+
     @abstractmethod
     def get_all_active(self) -> List[Sign]:
         """Obtiene todos los signos activos"""
@@ -58,7 +79,12 @@ class SignRepository(ABC):
 
     @abstractmethod
     def get_by_name(self, name: str) -> Optional[Sign]:
-        """Obtiene un signo por nombre (solo activos)"""
+        """Obtiene un signo por nombre, sin distinguir mayúsculas (solo activos)"""
+        pass
+
+    @abstractmethod
+    def get_by_names(self, names: List[str]) -> List[Sign]:
+        """Obtiene los signos activos cuyos nombres estén en la lista, sin distinguir mayúsculas (una sola consulta)"""
         pass
 
     @abstractmethod
@@ -77,6 +103,67 @@ class SignRepository(ABC):
         pass
 
     @abstractmethod
-    def get_by_id_with_user(self, sign_id: int) -> Optional[Dict[str, Any]]:
-        """Obtiene un signo por ID con información del usuario usando JOIN"""
+    def get_active_with_users_page(self, limit: int, after_id: Optional[int] = None,
+                                   fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Obtiene una página de signos activos con información del usuario (paginación keyset por ID).
+        Con 'fields' ('sign.id', 'user.email', ...) solo se consultan y retornan esos campos.
+        Retorna (items, last_id) donde last_id es None si no hay más páginas.
+        """
+        pass
+
+    @abstractmethod
+    def stream_active_with_users(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Recorre todos los signos activos con información del usuario sin materializar la lista completa"""
+        pass
+
+    @abstractmethod
+    def get_by_id_with_user(self, sign_id: int, fields: Optional[Tuple[str, ...]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene un signo por ID con información del usuario usando JOIN (con 'fields', solo esos campos).
+        Incluye 'version' de la misma fila, para que el ETag corresponda a los datos devueltos.
+        """
+        pass
+
+    @abstractmethod
+    def search_similar(self, name: str, limit: int, threshold: float) -> List[Dict[str, Any]]:
+        """Obtiene los signos activos más parecidos a 'name' (similitud de trigramas >= threshold, de mayor a menor)"""
+        pass
+
+    @abstractmethod
+    def get_sound_alike(self, name: str, limit: int) -> List[Dict[str, Any]]:
+        """Obtiene los signos activos cuyo nombre suena igual a 'name' (misma clave fonética)"""
+        pass
+
+    @abstractmethod
+    def get_version(self, sign_id: int) -> Optional[int]:
+        """Obtiene la versión de un signo activo (None si no existe) sin consultar el usuario"""
+        pass
+
+    @abstractmethod
+    def get_change_counter(self) -> int:
+        """Obtiene el contador de cambios de la colección de signos (crece con cada escritura)"""
+        pass
+
+    @abstractmethod
+    def bump_user_versions(self, user_id: int) -> int:
+        """Incrementa la versión de los signos activos de un usuario (tras cambiar sus datos)"""
+        pass
+
+class RevokedTokenRepository(ABC):
+    """Interfaz abstracta para el repositorio de tokens revocados"""
+
+    @abstractmethod
+    def revoke(self, token: RevokedToken) -> RevokedToken:
+        """Registra un token como revocado (idempotente por jti)"""
+        pass
+
+    @abstractmethod
+    def get_active_revoked_after(self, after_id: Optional[int], now: datetime) -> List[RevokedToken]:
+        """Obtiene los tokens revocados con id mayor que 'after_id' (todos si es None) que aún no expiraron, por id"""
+        pass
+
+    @abstractmethod
+    def purge_expired(self, now: datetime) -> int:
+        """Elimina los registros de tokens ya expirados; retorna cuántos se eliminaron"""
         pass
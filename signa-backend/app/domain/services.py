@@ -1,9 +1,27 @@
+import hashlib
+import logging
 import secrets
 import string
-from typing import List, Optional, Dict, Any, Tuple
+import time
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from .entities import User, UserCredentials, Sign
 from .repositories import UserRepository, UserCredentialsRepository, SignRepository
 from ..utils.password_service import PasswordService
+from ..utils.hashing_pool import HashingPoolSaturatedError
+from ..utils.cursor_service import CursorService
+from ..utils.transaction_service import TransactionService
+
+logger = logging.getLogger(__name__)
+
+# Campos que se pueden pedir con fields= en las lecturas de marcas ('sign' o 'user' = toda la sección)
+SIGN_READ_FIELDS = (
+    'sign.id', 'sign.sign_name', 'sign.status',
+    'user.id', 'user.name', 'user.surname', 'user.email', 'user.address', 'user.status'
+)
+
+class NotFoundError(Exception):
+    """Una entidad no existe: dentro de una unidad de trabajo provoca el rollback (-> 404)"""
+    pass
 
 class SignService:
     """Servicio de dominio para gestión de marcas/signos - Casos de uso"""
@@ -31,53 +49,51 @@ class SignService:
                 if field not in sign_data:
                     return False, {'error': f'Campo requerido para usuario: {field}'}, 400
             
-            # Verificar si la marca ya existe (solo activas)
-            existing_sign = self.sign_repository.get_by_name(sign_data['sign_name'])
-            if existing_sign:
-                return False, {'error': f"Ya existe una marca con el nombre '{sign_data['sign_name']}'"}, 400
-            
-            # Verificar si el usuario ya existe
+            # Verificar si el usuario ya existe y hashear antes de abrir la transacción de escritura
             existing_user = self.user_repository.get_by_email(sign_data['email'])
-            
-            if existing_user:
-                # Usar usuario existente
-                user = existing_user
-                user_created = False
-                credentials_created = False
-            else:
-                # Crear nuevo usuario
-                user = User(
-                    id=None,
-                    name=sign_data['name'],
-                    surname=sign_data['surname'],
-                    email=sign_data['email'],
-                    address=sign_data['address'],
-                    status=True
-                )
-                user = self.user_repository.create(user)
-                user_created = True
-                
-                # Generar contraseña aleatoria y crear credenciales
+            if existing_user is None:
                 plain_password = self.password_service.generate_random_password()
                 hashed_password = self.password_service.hash_password(plain_password)
+            
+            # Un solo COMMIT para usuario, credenciales y marca. Los nombres y emails duplicados
+            # (también los de peticiones concurrentes) los rechazan los índices únicos (ValueError -> 400)
+            with TransactionService.unit_of_work():
+                if existing_user:
+                    # Usar usuario existente
+                    user = existing_user
+                    user_created = False
+                    credentials_created = False
+                else:
+                    # Crear nuevo usuario
+                    user = User(
+                        id=None,
+                        name=sign_data['name'],
+                        surname=sign_data['surname'],
+                        email=sign_data['email'],
+                        address=sign_data['address'],
+                        status=True
+                    )
+                    user = self.user_repository.create(user)
+                    user_created = True
+                    
+                    # Crear credenciales
+                    credentials = UserCredentials(
+                        id=user.id,
+                        username=sign_data['email'],
+                        password=hashed_password,
+                        status=True
+                    )
+                    self.credentials_repository.create(credentials)
+                    credentials_created = True
                 
-                credentials = UserCredentials(
-                    id=user.id,
-                    username=sign_data['email'],
-                    password=hashed_password,
+                # Crear la marca
+                sign = Sign(
+                    id=None,
+                    sign_name=sign_data['sign_name'],
+                    user_id=user.id,
                     status=True
                 )
-                self.credentials_repository.create(credentials)
-                credentials_created = True
-            
-            # Crear la marca
-            sign = Sign(
-                id=None,
-                sign_name=sign_data['sign_name'],
-                user_id=user.id,
-                status=True
-            )
-            sign = self.sign_repository.create(sign)
+                sign = self.sign_repository.create(sign)
             
             response_data = {
                 'message': 'Marca creada exitosamente',
@@ -108,9 +124,158 @@ class SignService:
             
             return True, response_data, 201
             
+        except ValueError as e:
+            return False, {'error': str(e)}, 400
+        except HashingPoolSaturatedError as e:
+            return False, {'error': str(e)}, 503
         except Exception as e:
             return False, {'error': 'Error interno del servidor'}, 500
     
+    # CASO DE USO: Crear marcas en lote
+    def create_signs_bulk(self, items: List[Dict[str, Any]], max_new_users: Optional[int] = None) -> Tuple[bool, Dict[str, Any], int]:
+        """
+        Caso de uso: Crear varias marcas (y sus usuarios) en una sola operación.
+        Los nombres y emails se deduplican dentro del lote (sin distinguir mayúsculas), los
+        existentes se resuelven con una consulta IN y las inserciones se hacen en lote.
+        Cada usuario nuevo cuesta un hash de contraseña: con más de max_new_users emails
+        nuevos el lote se rechaza (413) antes de hashear.
+        Returns: (success, data, status_code) con un resultado por cada item
+        """
+        try:
+            results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+            required_fields = ['sign_name', 'name', 'surname', 'email', 'address']
+
+            # Validar cada item y deduplicar nombres dentro del lote
+            valid_indexes = []
+            seen_names = set()
+            for index, item in enumerate(items):
+                if not isinstance(item, dict):
+                    results[index] = {'index': index, 'success': False, 'error': 'Cada item debe ser un objeto'}
+                    continue
+
+                missing = [field for field in required_fields if not item.get(field)]
+                if missing:
+                    results[index] = {'index': index, 'success': False, 'error': f'Campo requerido: {missing[0]}'}
+                    continue
+
+                not_text = [field for field in required_fields if not isinstance(item[field], str)]
+                if not_text:
+                    results[index] = {'index': index, 'success': False, 'error': f'El campo {not_text[0]} debe ser texto'}
+                    continue
+
+                if item['sign_name'].lower() in seen_names:
+                    results[index] = {'index': index, 'success': False, 'error': f"Nombre de marca duplicado en el lote: '{item['sign_name']}'"}
+                    continue
+
+                seen_names.add(item['sign_name'].lower())
+                valid_indexes.append(index)
+
+            # Resolver marcas ya existentes con una sola consulta
+            existing_names = {sign.sign_name.lower() for sign in self.sign_repository.get_by_names(list(seen_names))}
+            pending_indexes = []
+            for index in valid_indexes:
+                sign_name = items[index]['sign_name']
+                if sign_name.lower() in existing_names:
+                    results[index] = {'index': index, 'success': False, 'error': f"Ya existe una marca con el nombre '{sign_name}'"}
+                else:
+                    pending_indexes.append(index)
+
+            # Resolver usuarios existentes con una sola consulta y preparar los nuevos (uno por email)
+            emails = list(dict.fromkeys(items[index]['email'].lower() for index in pending_indexes))
+            users_by_email = {user.email.lower(): user for user in self.user_repository.get_by_emails(emails)}
+
+            new_users = []
+            new_user_indexes = {}
+            for index in pending_indexes:
+                item = items[index]
+                email = item['email'].lower()
+                if email in users_by_email or email in new_user_indexes:
+                    continue
+                try:
+                    new_users.append(User(
+                        id=None,
+                        name=item['name'],
+                        surname=item['surname'],
+                        email=item['email'],
+                        address=item['address'],
+                        status=True
+                    ))
+                except ValueError as e:
+                    results[index] = {'index': index, 'success': False, 'error': str(e)}
+                    continue
+                new_user_indexes[email] = index
+
+            if max_new_users is not None and len(new_users) > max_new_users:
+                return False, {
+                    'error': f'El lote crea {len(new_users)} usuarios nuevos; máximo {max_new_users} por petición '
+                             f'(crear los usuarios antes o dividir el lote)'
+                }, 413
+
+            # Hashear antes de insertar, para no mantener filas bloqueadas durante el cálculo
+            passwords = [self.password_service.generate_random_password() for _ in new_users]
+            hashed_passwords = self.password_service.hash_passwords(passwords)
+            plain_passwords = {user.email.lower(): password for user, password in zip(new_users, passwords)}
+
+            # Un solo COMMIT para todas las inserciones del lote
+            with TransactionService.unit_of_work():
+                if new_users:
+                    created_users = self.user_repository.create_many(new_users)
+
+                    self.credentials_repository.create_many([
+                        UserCredentials(id=user.id, username=user.email, password=hashed, status=True)
+                        for user, hashed in zip(created_users, hashed_passwords)
+                    ])
+
+                    for user in created_users:
+                        users_by_email[user.email.lower()] = user
+
+                # Insertar todas las marcas pendientes en lote
+                sign_indexes = [index for index in pending_indexes if results[index] is None and items[index]['email'].lower() in users_by_email]
+                created_signs = self.sign_repository.create_many([
+                    Sign(id=None, sign_name=items[index]['sign_name'], user_id=users_by_email[items[index]['email'].lower()].id, status=True)
+                    for index in sign_indexes
+                ])
+
+            for index, sign in zip(sign_indexes, created_signs):
+                email = items[index]['email'].lower()
+                user_created = new_user_indexes.get(email) == index
+                result = {
+                    'index': index,
+                    'success': True,
+                    'sign': {
+                        'id': sign.id,
+                        'sign_name': sign.sign_name,
+                        'status': sign.status
+                    },
+                    'user': {
+                        'id': users_by_email[email].id,
+                        'email': users_by_email[email].email
+                    },
+                    'user_created': user_created
+                }
+                if user_created:
+                    result['note'] = f"Usuario y credenciales creados. Contraseña: {plain_passwords[email]}"
+                results[index] = result
+
+            created_count = len(created_signs)
+            response_data = {
+                'message': 'Carga masiva de marcas procesada',
+                'total': len(items),
+                'created': created_count,
+                'failed': len(items) - created_count,
+                'results': results
+            }
+
+            return created_count > 0, response_data, 201 if created_count > 0 else 400
+
+        except ValueError as e:
+            # Otra petición insertó un nombre o email del lote entre la consulta y el INSERT
+            return False, {'error': str(e)}, 400
+        except HashingPoolSaturatedError as e:
+            return False, {'error': str(e)}, 503
+        except Exception as e:
+            return False, {'error': 'Error interno del servidor'}, 500
+
     # CASO DE USO: Actualizar marca
     def update_sign(self, sign_id: int, update_data: Dict[str, Any]) -> Tuple[bool, Dict[str, Any], int]:
         """
@@ -136,30 +301,32 @@ class SignService:
                 if field in update_data:
                     user_data[field] = update_data[field]
             
-            # Campos de credenciales
+            # Campos de credenciales (la contraseña se hashea antes de abrir la transacción de escritura)
             if 'password' in update_data:
-                credentials_data['password'] = update_data['password']
-            
-            # Actualizar marca si hay datos
-            if sign_data:
-                updated_sign = self._update_sign_fields(sign_id, sign_data)
-                if not updated_sign:
-                    return False, {'error': 'Marca no encontrada'}, 404
+                credentials_data['password'] = self.password_service.hash_password(update_data['password'])
             
-            # Actualizar usuario si hay datos
-            if user_data:
-                updated_user = self._update_user_fields(sign_id, user_data)
-                if not updated_user:
-                    return False, {'error': 'Usuario no encontrado'}, 404
-            
-            # Actualizar credenciales si hay datos
-            if credentials_data:
-                updated_credentials = self._update_credentials_fields(sign_id, credentials_data)
-                if not updated_credentials:
-                    return False, {'error': 'Credenciales no encontradas'}, 404
-            
-            # Obtener la información completa actualizada
-            complete_sign_info = self.get_sign_by_id(sign_id)
+            # Un solo COMMIT para marca, usuario y credenciales (NotFoundError deshace lo anterior)
+            with TransactionService.unit_of_work():
+                # Actualizar marca si hay datos
+                if sign_data:
+                    updated_sign = self._update_sign_fields(sign_id, sign_data)
+                    if not updated_sign:
+                        raise NotFoundError('Marca no encontrada')
+                
+                # Actualizar usuario si hay datos
+                if user_data:
+                    updated_user = self._update_user_fields(sign_id, user_data)
+                    if not updated_user:
+                        raise NotFoundError('Usuario no encontrado')
+                
+                # Actualizar credenciales si hay datos
+                if credentials_data:
+                    updated_credentials = self._update_credentials_fields(sign_id, credentials_data)
+                    if not updated_credentials:
+                        raise NotFoundError('Credenciales no encontradas')
+                
+                # Obtener la información completa actualizada
+                complete_sign_info = self.get_sign_by_id(sign_id)
             
             response_data = {
                 'message': 'Marca actualizada exitosamente',
@@ -169,31 +336,109 @@ class SignService:
             
             return True, response_data, 200
             
+        except NotFoundError as e:
+            return False, {'error': str(e)}, 404
         except ValueError as e:
             return False, {'error': str(e)}, 400
+        except HashingPoolSaturatedError as e:
+            return False, {'error': str(e)}, 503
         except Exception as e:
             return False, {'error': 'Error interno del servidor'}, 500
     
-    # CASO DE USO: Obtener todas las marcas
-    def get_all_signs(self) -> Tuple[bool, Dict[str, Any], int]:
+    # CASO DE USO: Obtener marcas paginadas
+    def get_all_signs(self, limit: int, after: Optional[str] = None, fields: Optional[str] = None) -> Tuple[bool, Dict[str, Any], int]:
         """
-        Caso de uso: Obtener todas las marcas activas con información del usuario
+        Caso de uso: Obtener una página de marcas activas con información del usuario.
+        La paginación es por cursor (keyset): 'after' es el next_cursor de la página anterior.
+        'fields' limita los campos consultados y retornados (p. ej. "sign.id,sign.sign_name,user.email").
         Returns: (success, data, status_code)
         """
         try:
-            signs = self.sign_repository.get_all_active_with_users()
-            
+            if limit < 1:
+                return False, {'error': 'El parámetro limit debe ser mayor que 0'}, 400
+
+            after_id = CursorService.decode(after)
+            selected_fields = self.parse_fields(fields)
+            signs, last_id = self.sign_repository.get_active_with_users_page(limit, after_id, selected_fields)
+
             response_data = {
                 'message': 'Marcas obtenidas exitosamente',
-                'total': len(signs),
+                'count': len(signs),
+                'limit': limit,
+                'next_cursor': CursorService.encode(last_id) if last_id is not None else None,
                 'signs': signs
             }
-            
+
             return True, response_data, 200
-            
+
+        except ValueError as e:
+            return False, {'error': str(e)}, 400
+        except Exception as e:
+            return False, {'error': 'Error interno del servidor'}, 500
+    
+    # CASO DE USO: Buscar marcas similares
+    def search_similar_signs(self, name: Optional[str], limit: int, threshold: float) -> Tuple[bool, Dict[str, Any], int]:
+        """
+        Caso de uso: Buscar marcas activas con nombre parecido (detección de conflictos de marca).
+        Ordenadas por similitud de trigramas, de mayor a menor.
+        Returns: (success, data, status_code)
+        """
+        try:
+            if not name or not name.strip():
+                return False, {'error': 'El parámetro name es requerido'}, 400
+            if limit < 1:
+                return False, {'error': 'El parámetro limit debe ser mayor que 0'}, 400
+
+            signs = self.sign_repository.search_similar(name.strip(), limit, threshold)
+
+            response_data = {
+                'message': 'Marcas similares obtenidas exitosamente',
+                'query': name.strip(),
+                'count': len(signs),
+                'signs': signs
+            }
+
+            return True, response_data, 200
+
+        except Exception as e:
+            logger.exception("Error buscando marcas similares")
+            return False, {'error': 'Error interno del servidor'}, 500
+    
+    # CASO DE USO: Buscar marcas que suenan igual
+    def search_sound_alike_signs(self, name: Optional[str], limit: int) -> Tuple[bool, Dict[str, Any], int]:
+        """
+        Caso de uso: Buscar marcas activas cuyo nombre suena igual (clave fonética en español).
+        Returns: (success, data, status_code)
+        """
+        try:
+            if not name or not name.strip():
+                return False, {'error': 'El parámetro name es requerido'}, 400
+            if limit < 1:
+                return False, {'error': 'El parámetro limit debe ser mayor que 0'}, 400
+
+            signs = self.sign_repository.get_sound_alike(name.strip(), limit)
+
+            response_data = {
+                'message': 'Marcas que suenan igual obtenidas exitosamente',
+                'query': name.strip(),
+                'count': len(signs),
+                'signs': signs
+            }
+
+            return True, response_data, 200
+
         except Exception as e:
+            logger.exception("Error buscando marcas que suenan igual")
             return False, {'error': 'Error interno del servidor'}, 500
     
+    # CASO DE USO: Exportar marcas
+    def export_signs(self, batch_size: int) -> Iterator[Dict[str, Any]]:
+        """
+        Caso de uso: Exportar todas las marcas activas con información del usuario.
+        Returns: iterador de registros (se consume mientras se envía la respuesta)
+        """
+        return self.sign_repository.stream_active_with_users(batch_size)
+    
     # CASO DE USO: Obtener marca por ID
     def get_sign_by_id(self, sign_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -202,27 +447,89 @@ class SignService:
         """
         return self.sign_repository.get_by_id_with_user(sign_id)
     
+    # CASO DE USO: Versiones para peticiones condicionales (ETag)
+    def get_sign_etag(self, sign_id: int, fields: Optional[str] = None) -> Optional[str]:
+        """
+        Caso de uso: Obtener el ETag de una marca sin consultar su usuario (solo para responder 304
+        antes de leerla; el ETag de una respuesta con cuerpo lo da get_sign_by_id_validated).
+        Cada valor de 'fields' es una representación distinta y tiene su propio ETag.
+        Returns: ETag o None si la marca no existe
+        """
+        version = self.sign_repository.get_version(sign_id)
+        if version is None:
+            return None
+        return self.build_sign_etag(sign_id, version, fields)
+    
+    def get_signs_list_etag(self, *params: Any, max_age_seconds: int = 0) -> str:
+        """
+        Caso de uso: Obtener el ETag de un listado de marcas: contador de cambios de la
+        colección más los parámetros de la petición (limit, cursor, ...).
+        Con max_age_seconds > 0 el ETag cambia además cada ese intervalo: en PostgreSQL una
+        transacción lenta puede confirmar una versión menor que el máximo ya visible.
+        """
+        if max_age_seconds > 0:
+            params += (int(time.time() // max_age_seconds),)
+        return self.build_signs_list_etag(self.sign_repository.get_change_counter(), params)
+    
+    @staticmethod
+    def build_sign_etag(sign_id: int, version: int, fields: Optional[str] = None) -> str:
+        """ETag de una marca a partir de su versión (y de 'fields', si se pidió)"""
+        if fields:
+            return f"sign-{sign_id}-v{version}-{hashlib.sha1(fields.encode('utf-8')).hexdigest()[:12]}"
+        return f"sign-{sign_id}-v{version}"
+    
+    @staticmethod
+    def build_signs_list_etag(counter: int, params: Tuple[Any, ...]) -> str:
+        """ETag de un listado a partir del contador de cambios y los parámetros de la petición"""
+        digest = hashlib.sha1(repr(params).encode('utf-8')).hexdigest()[:12]
+        return f"signs-c{counter}-{digest}"
+    
+    @staticmethod
+    def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Valida el parámetro fields contra SIGN_READ_FIELDS.
+        Returns: campos en orden canónico, o None si no se pidió ninguno (todos los campos)
+        Raises: ValueError si hay un campo no permitido
+        """
+        if not fields or not fields.strip():
+            return None
+        
+        requested = set()
+        for field in (part.strip() for part in fields.split(',')):
+            if field in ('sign', 'user'):
+                requested.update(name for name in SIGN_READ_FIELDS if name.startswith(f'{field}.'))
+            elif field in SIGN_READ_FIELDS:
+                requested.add(field)
+            elif field:
+                raise ValueError(f"Campo no permitido en fields: '{field}'. Permitidos: {', '.join(SIGN_READ_FIELDS)}")
+        
+        return tuple(name for name in SIGN_READ_FIELDS if name in requested) or None
+    
     # CASO DE USO: Obtener marca por ID con validación
-    def get_sign_by_id_validated(self, sign_id: int) -> Tuple[bool, Dict[str, Any], int]:
+    def get_sign_by_id_validated(self, sign_id: int, fields: Optional[str] = None) -> Tuple[bool, Dict[str, Any], int, Optional[str]]:
         """
-        Caso de uso: Obtener una marca por ID con validación
-        Returns: (success, data, status_code)
+        Caso de uso: Obtener una marca por ID con validación ('fields' limita los campos retornados).
+        El ETag sale de la versión leída junto con los datos (caché o réplica incluidas).
+        Returns: (success, data, status_code, etag)
         """
         try:
-            sign = self.get_sign_by_id(sign_id)
+            sign = self.sign_repository.get_by_id_with_user(sign_id, self.parse_fields(fields))
             
             if not sign:
-                return False, {'error': 'Marca no encontrada'}, 404
+                return False, {'error': 'Marca no encontrada'}, 404, None
             
+            # Copia sin la versión: el registro puede ser el de la caché, compartido entre peticiones
             response_data = {
                 'message': 'Marca obtenida exitosamente',
-                'sign': sign
+                'sign': {key: value for key, value in sign.items() if key != 'version'}
             }
             
-            return True, response_data, 200
+            return True, response_data, 200, self.build_sign_etag(sign_id, sign['version'], fields)
             
+        except ValueError as e:
+            return False, {'error': str(e)}, 400, None
         except Exception as e:
-            return False, {'error': 'Error interno del servidor'}, 500
+            return False, {'error': 'Error interno del servidor'}, 500, None
     
     # CASO DE USO: Soft delete marca
     def soft_delete_sign(self, sign_id: int) -> Tuple[bool, Dict[str, Any], int]:
@@ -247,19 +554,8 @@ class SignService:
     
     # Métodos privados para lógica interna
     def _update_sign_fields(self, sign_id: int, sign_data: Dict[str, Any]) -> Optional[Sign]:
-        """Actualiza campos de la marca"""
-        # Verificar si la marca existe
-        existing_sign = self.sign_repository.get_by_id(sign_id)
-        if not existing_sign:
-            return None
-        
-        # Si se está cambiando el nombre, verificar que no exista otra marca con ese nombre
-        if 'sign_name' in sign_data and sign_data['sign_name'] != existing_sign.sign_name:
-            duplicate_sign = self.sign_repository.get_by_name(sign_data['sign_name'])
-            if duplicate_sign:
-                raise ValueError(f"Ya existe una marca con el nombre '{sign_data['sign_name']}'")
-        
-        # Actualizar solo los campos proporcionados
+        """Actualiza campos de la marca (None si no existe; ValueError si el nombre ya está en uso)"""
+        # Actualizar solo los campos proporcionados; el índice único rechaza nombres duplicados
         return self.sign_repository.update(sign_id, **sign_data)
     
     def _update_user_fields(self, sign_id: int, user_data: Dict[str, Any]) -> Optional[User]:
@@ -270,19 +566,19 @@ class SignService:
             return None
         
         # Actualizar usuario
-        return self.user_repository.update(sign.user_id, **user_data)
+        updated_user = self.user_repository.update(sign.user_id, **user_data)
+        if updated_user:
+            # Los datos del usuario forman parte de sus marcas: cambia su versión (ETag)
+            self.sign_repository.bump_user_versions(sign.user_id)
+        return updated_user
     
     def _update_credentials_fields(self, sign_id: int, credentials_data: Dict[str, Any]) -> Optional[UserCredentials]:
-        """Actualiza campos de las credenciales"""
+        """Actualiza campos de las credenciales (la contraseña llega ya hasheada)"""
         # Obtener la marca
         sign = self.sign_repository.get_by_id(sign_id)
         if not sign:
             return None
         
-        # Si se está cambiando la contraseña, hashearla
-        if 'password' in credentials_data:
-            credentials_data['password'] = self.password_service.hash_password(credentials_data['password'])
-        
         # Actualizar credenciales
         return self.credentials_repository.update(sign.user_id, **credentials_data)
 
@@ -296,33 +592,35 @@ class UserService:
     
     def create_user(self, name: str, surname: str, email: str, address: str) -> User:
         """Crea un nuevo usuario con credenciales"""
-        # Verificar si el usuario ya existe
+        # Verificar si el usuario ya existe antes de pagar el hash (el índice único cubre la concurrencia)
         existing_user = self.user_repository.get_by_email(email)
         if existing_user:
             raise ValueError(f"Ya existe un usuario con el email '{email}'")
         
-        # Crear usuario
-        user = User(
-            id=None,
-            name=name,
-            surname=surname,
-            email=email,
-            address=address,
-            status=True
-        )
-        user = self.user_repository.create(user)
-        
-        # Generar contraseña aleatoria y crear credenciales
+        # Generar contraseña aleatoria antes de abrir la transacción de escritura
         plain_password = self.password_service.generate_random_password()
         hashed_password = self.password_service.hash_password(plain_password)
         
-        credentials = UserCredentials(
-            id=user.id,
-            username=email,  # Username será igual al email
-            password=hashed_password,
-            status=True
-        )
-        self.credentials_repository.create(credentials)
+        # Un solo COMMIT para usuario y credenciales
+        with TransactionService.unit_of_work():
+            # Crear usuario
+            user = User(
+                id=None,
+                name=name,
+                surname=surname,
+                email=email,
+                address=address,
+                status=True
+            )
+            user = self.user_repository.create(user)
+            
+            credentials = UserCredentials(
+                id=user.id,
+                username=email,  # Username será igual al email
+                password=hashed_password,
+                status=True
+            )
+            self.credentials_repository.create(credentials)
         
         return user
     
@@ -337,6 +635,14 @@ class UserService:
         if not self.password_service.verify_password(password, credentials.password):
             return None
         
+        # Regenerar el hash si fue creado con otro algoritmo o costo (el login no falla si esto falla)
+        if self.password_service.needs_rehash(credentials.password):
+            try:
+                new_hash = self.password_service.hash_password(password)
+                self.credentials_repository.update(credentials.id, password=new_hash)
+            except Exception as e:
+                logger.warning(f"⚠️  No se pudo regenerar el hash de la contraseña: {str(e)}")
+        
         # Obtener usuario
         user = self.user_repository.get_by_email(username)  # username es el email
         return user
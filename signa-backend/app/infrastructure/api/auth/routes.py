@@ -2,6 +2,9 @@ from flask import Blueprint, request, jsonify
 from ....domain.services import UserService
 from ....infrastructure.repositories import SQLAlchemyUserRepository, SQLAlchemyUserCredentialsRepository
 from ....utils.jwt_service import JWTService
+from ....utils.hashing_pool import HashingPoolSaturatedError
+from ....utils.auth_guard import require_auth, get_current_user_data
+from ....utils.revocation_filter import get_revocation_filter
 
 # Crear blueprint para rutas de autenticación
 auth_bp = Blueprint('auth', __name__)
@@ -37,11 +40,13 @@ def register():
             'message': 'Usuario registrado exitosamente',
             'user_id': user.id,
             'username': user.email,  # El username es el email
-            'note': 'La contraseña se genera automáticamente y se hashea con bcrypt (12 rounds). Usa /login para obtener tu token JWT.'
+            'note': 'La contraseña se genera automáticamente y se hashea (bcrypt o argon2id según configuración). Usa /login para obtener tu token JWT.'
         }), 201
         
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
+    except HashingPoolSaturatedError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'error': 'Error interno del servidor'}), 500
 
@@ -84,10 +89,24 @@ def login():
             }
         }), 200
         
+    except HashingPoolSaturatedError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'error': 'Error interno del servidor'}), 500
 
 @auth_bp.route('/logout', methods=['POST'])
+@require_auth
 def logout():
-    """Endpoint para cerrar sesión"""
-    return jsonify({'message': 'Logout exitoso'}), 200
+    """Endpoint para cerrar sesión: revoca el token actual hasta su expiración"""
+    try:
+        payload = get_current_user_data()
+        
+        if not payload.get('jti'):
+            return jsonify({'error': 'El token no se puede revocar (emitido sin jti), inicie sesión nuevamente'}), 400
+        
+        get_revocation_filter().revoke(payload['jti'], payload['exp'])
+        
+        return jsonify({'message': 'Logout exitoso'}), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Error interno del servidor'}), 500
@@ -0,0 +1 @@
+# Ops routes package initialization
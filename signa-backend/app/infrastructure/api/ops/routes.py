@@ -0,0 +1,33 @@
+from flask import Blueprint, jsonify
+from ....infrastructure.database.models import db
+from ....infrastructure.cached_repositories import CachedSignRepository
+from ..sign.routes import sign_repository
+from ....utils.auth_guard import require_auth
+from ....utils.db_pool import pool_stats
+from ....utils.hashing_pool import get_hashing_pool
+from ....utils.read_replica import REPLICA_BIND_KEY, get_read_replica_router
+
+# Crear blueprint para rutas operativas
+ops_bp = Blueprint('ops', __name__)
+
+@ops_bp.route('/pool', methods=['GET'])
+@require_auth
+def get_pool_stats():
+    """
+    Endpoint con el estado de los pools del worker que atiende la petición
+    (conexiones a la base de datos, hashing de contraseñas y caché de marcas, si está
+    habilitada). Cada worker tiene los suyos.
+    """
+    stats = {
+        'database': pool_stats(db.engine),
+        'hashing': get_hashing_pool().stats()
+    }
+    
+    router = get_read_replica_router()
+    if router.configured():
+        stats['replica'] = {**pool_stats(db.engines[REPLICA_BIND_KEY]), 'routing': router.stats()}
+    
+    if isinstance(sign_repository, CachedSignRepository):
+        stats['sign_cache'] = sign_repository.stats()
+    
+    return jsonify(stats), 200
@@ -1,7 +1,10 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from ....domain.services import SignService
 from ....infrastructure.repositories import SQLAlchemyUserRepository, SQLAlchemyUserCredentialsRepository, SQLAlchemySignRepository
+from ....infrastructure.cached_repositories import CachedSignRepository
 from ....utils.auth_guard import require_auth
+from ....utils.ttl_cache import TTLCache
+from config import Config
 
 # Crear blueprint para rutas de signos
 sign_bp = Blueprint('sign', __name__)
@@ -11,6 +14,15 @@ user_repository = SQLAlchemyUserRepository()
 credentials_repository = SQLAlchemyUserCredentialsRepository()
 sign_repository = SQLAlchemySignRepository()
 
+# Caché de lecturas por ID (opcional, ver SIGN_CACHE_ENABLED)
+if Config.SIGN_CACHE_ENABLED:
+    sign_repository = CachedSignRepository(
+        sign_repository,
+        TTLCache(Config.SIGN_CACHE_MAX_ENTRIES, Config.SIGN_CACHE_TTL_SECONDS),
+        # Con réplica: no cachear lecturas que todavía pueden venir con retraso tras una escritura
+        stale_read_seconds=Config.DB_READ_YOUR_WRITES_SECONDS if Config.DATABASE_REPLICA_URL else 0
+    )
+
 # Crear instancia de servicio
 sign_service = SignService(sign_repository, user_repository, credentials_repository)
 
@@ -22,6 +34,28 @@ def create_sign():
     success, response_data, status_code = sign_service.create_sign_with_user(data)
     return jsonify(response_data), status_code
 
+@sign_bp.route('/bulk', methods=['POST'])
+@require_auth
+def create_signs_bulk():
+    """Endpoint para crear varias marcas (con sus usuarios) en una sola petición"""
+    data = request.get_json()
+    items = data.get('signs') if isinstance(data, dict) else data
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Se requiere una lista no vacía de marcas'}), 400
+    
+    max_items = current_app.config['SIGN_BULK_MAX_ITEMS']
+    if len(items) > max_items:
+        return jsonify({'error': f'Máximo {max_items} marcas por petición'}), 413
+    
+    success, response_data, status_code = sign_service.create_signs_bulk(
+        items, max_new_users=current_app.config['SIGN_BULK_MAX_NEW_USERS']
+    )
+    if status_code == 503:
+        # Pool de hashing saturado: reintentar más tarde, igual que en auth
+        return jsonify(response_data), 503, {'Retry-After': '1'}
+    return jsonify(response_data), status_code
+
 @sign_bp.route('/<int:sign_id>', methods=['PATCH'])
 @require_auth
 def update_sign(sign_id):
@@ -33,16 +67,98 @@ def update_sign(sign_id):
 @sign_bp.route('/list', methods=['GET'])
 @require_auth
 def get_all_signs():
-    """Endpoint para obtener todas las marcas activas con información del usuario"""
-    success, response_data, status_code = sign_service.get_all_signs()
+    """
+    Endpoint para obtener las marcas activas con información del usuario, paginadas por cursor.
+    Query params: limit (opcional), after (next_cursor de la página anterior) y
+    fields (opcional, p. ej. "sign.id,sign.sign_name,user.email").
+    """
+    try:
+        limit = int(request.args.get('limit', current_app.config['SIGN_LIST_DEFAULT_LIMIT']))
+    except ValueError:
+        return jsonify({'error': 'El parámetro limit debe ser un entero'}), 400
+    
+    limit = min(limit, current_app.config['SIGN_LIST_MAX_LIMIT'])
+    
+    # Si el listado no cambió desde la versión que tiene el cliente, 304 sin consultar las marcas
+    after = request.args.get('after')
+    fields = request.args.get('fields')
+    etag = sign_service.get_signs_list_etag(
+        limit, after, fields, max_age_seconds=current_app.config['SIGN_LIST_ETAG_MAX_AGE_SECONDS']
+    )
+    if request.if_none_match.contains_weak(etag):
+        return _not_modified(etag)
+    
+    success, response_data, status_code = sign_service.get_all_signs(limit, after, fields)
+    response = jsonify(response_data)
+    if success:
+        response.set_etag(etag, weak=True)
+    return response, status_code
+
+@sign_bp.route('/similar', methods=['GET'])
+@require_auth
+def search_similar_signs():
+    """
+    Endpoint para buscar marcas activas con nombre parecido (similitud de trigramas).
+    Query params: name (requerido) y limit (opcional).
+    """
+    try:
+        limit = int(request.args.get('limit', current_app.config['SIGN_SIMILAR_DEFAULT_LIMIT']))
+    except ValueError:
+        return jsonify({'error': 'El parámetro limit debe ser un entero'}), 400
+    
+    limit = min(limit, current_app.config['SIGN_SIMILAR_MAX_LIMIT'])
+    success, response_data, status_code = sign_service.search_similar_signs(
+        request.args.get('name'), limit, current_app.config['SIGN_SIMILARITY_THRESHOLD']
+    )
     return jsonify(response_data), status_code
 
+@sign_bp.route('/sound-alike', methods=['GET'])
+@require_auth
+def search_sound_alike_signs():
+    """
+    Endpoint para buscar marcas activas cuyo nombre suena igual (clave fonética en español).
+    Query params: name (requerido) y limit (opcional).
+    """
+    try:
+        limit = int(request.args.get('limit', current_app.config['SIGN_SIMILAR_DEFAULT_LIMIT']))
+    except ValueError:
+        return jsonify({'error': 'El parámetro limit debe ser un entero'}), 400
+    
+    limit = min(limit, current_app.config['SIGN_SIMILAR_MAX_LIMIT'])
+    success, response_data, status_code = sign_service.search_sound_alike_signs(request.args.get('name'), limit)
+    return jsonify(response_data), status_code
+
+@sign_bp.route('/export', methods=['GET'])
+@require_auth
+def export_signs():
+    """Endpoint para exportar todas las marcas activas con usuario como NDJSON (respuesta en streaming)"""
+    records = sign_service.export_signs(current_app.config['SIGN_EXPORT_BATCH_SIZE'])
+    
+    def generate():
+        # Mismo proveedor JSON de la aplicación (orjson si está disponible)
+        for record in records:
+            yield current_app.json.dumps(record) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @sign_bp.route('/<int:sign_id>', methods=['GET'])
 @require_auth
 def get_sign_by_id(sign_id):
-    """Endpoint para obtener una marca por ID con información del usuario"""
-    success, response_data, status_code = sign_service.get_sign_by_id_validated(sign_id)
-    return jsonify(response_data), status_code
+    """Endpoint para obtener una marca por ID con información del usuario (query param fields opcional)"""
+    # Versión de la marca con una consulta por clave primaria: 304 sin el JOIN ni la serialización
+    fields = request.args.get('fields')
+    etag = sign_service.get_sign_etag(sign_id, fields)
+    if etag is None:
+        return jsonify({'error': 'Marca no encontrada'}), 404
+    if request.if_none_match.contains_weak(etag):
+        return _not_modified(etag)
+    
+    # El ETag de la respuesta sale de la misma lectura que el cuerpo (puede venir de la caché o la réplica)
+    success, response_data, status_code, etag = sign_service.get_sign_by_id_validated(sign_id, fields)
+    response = jsonify(response_data)
+    if success:
+        response.set_etag(etag, weak=True)
+    return response, status_code
 
 @sign_bp.route('/<int:sign_id>', methods=['DELETE'])
 @require_auth
@@ -50,3 +166,9 @@ def soft_delete_sign(sign_id):
     """Endpoint para eliminar suavemente una marca (soft delete)"""
     success, response_data, status_code = sign_service.soft_delete_sign(sign_id)
     return jsonify(response_data), status_code
+
+def _not_modified(etag: str) -> Response:
+    """Respuesta 304 Not Modified con el ETag vigente"""
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,198 @@
+import threading
+from collections import defaultdict
+from typing import List, Optional, Dict, Any, Tuple, Iterator, Set
+from app.domain.repositories import SignRepository
+from app.domain.entities import Sign
+from ..utils.ttl_cache import TTLCache
+from ..utils.transaction_service import TransactionService
+
+class CachedSignRepository(SignRepository):
+    """
+    Decorador de SignRepository con caché LRU+TTL de las lecturas por ID
+    (get_by_id y get_by_id_with_user). El resto de operaciones se delega.
+
+    - Las escrituras (también bump_user_versions, tras cambiar el usuario) invalidan al
+      instante y de nuevo tras el commit, para descartar lo que otra petición haya
+      cacheado mientras la transacción seguía abierta.
+    - Cada invalidación incrementa una generación: una lectura que empezó antes no
+      guarda su resultado (podría ser la fila anterior a la escritura).
+    - Con réplica de lectura, durante stale_read_seconds tras invalidar una marca (o
+      su usuario) las lecturas no se cachean: la réplica puede seguir con la fila vieja.
+    - Dentro de una unidad de trabajo las lecturas no usan la caché: ven los cambios
+      propios sin confirmar y nunca los dejan cacheados.
+    - La caché es del proceso: en otros workers un cambio se ve al vencer el TTL.
+    - Los valores cacheados se comparten entre peticiones y no deben modificarse.
+    """
+
+    def __init__(self, repository: SignRepository, cache: TTLCache, stale_read_seconds: float = 0):
+        self.repository = repository
+        self.cache = cache
+        # user_id -> IDs de signos cacheados, para invalidar al cambiar datos del usuario
+        self._sign_ids_by_user: Dict[int, Set[int]] = defaultdict(set)
+        self._indexed_sign_ids = 0
+        self._generation = 0
+        # Marcas y usuarios invalidados hace menos de stale_read_seconds (réplica con retraso)
+        self._recently_invalidated = TTLCache(cache.max_entries, stale_read_seconds) if stale_read_seconds > 0 else None
+        self._lock = threading.Lock()
+
+    # Lecturas cacheadas
+
+    def get_by_id(self, sign_id: int) -> Optional[Sign]:
+        return self._read_through(('sign', sign_id), sign_id, lambda: self.repository.get_by_id(sign_id),
+                                  lambda sign: sign.user_id)
+
+    def get_by_id_with_user(self, sign_id: int, fields: Optional[Tuple[str, ...]] = None) -> Optional[Dict[str, Any]]:
+        # Se cachea el registro completo y los campos pedidos se toman de él
+        sign = self._read_through(('sign_with_user', sign_id), sign_id, lambda: self.repository.get_by_id_with_user(sign_id),
+                                  lambda sign: sign['user']['id'])
+        if sign is None or not fields:
+            return sign
+        return self._select_fields(sign, fields)
+
+    @staticmethod
+    def _select_fields(sign: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+        # La versión acompaña siempre a los campos (ETag de la respuesta)
+        result = {'version': sign['version']}
+        for section in ('sign', 'user'):
+            selected = {field: value for field, value in sign[section].items() if f'{section}.{field}' in fields}
+            if selected:
+                result[section] = selected
+        return result
+
+    def _read_through(self, key, sign_id: int, load, get_user_id):
+        if TransactionService.in_unit_of_work():
+            return load()
+
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+
+        generation = self._generation
+        value = load()
+        if value is not None:
+            user_id = get_user_id(value)
+            if self._recently_invalidated is not None and (
+                self._recently_invalidated.contains(('sign', sign_id)) or self._recently_invalidated.contains(('user', user_id))
+            ):
+                return value
+
+            with self._lock:
+                # Hubo una invalidación durante la carga: el valor puede ser anterior a la escritura
+                if generation != self._generation:
+                    return value
+                self._remember(user_id, sign_id)
+                self.cache.set(key, value)
+        return value
+
+    def _remember(self, user_id: int, sign_id: int) -> None:
+        # Con self._lock tomado
+        sign_ids = self._sign_ids_by_user[user_id]
+        if sign_id not in sign_ids:
+            sign_ids.add(sign_id)
+            self._indexed_sign_ids += 1
+
+        # Las entradas desalojadas por LRU o vencidas dejan IDs en el índice: se podan al duplicar la capacidad
+        if self._indexed_sign_ids > 2 * self.cache.max_entries:
+            self._prune_index()
+
+    def _prune_index(self) -> None:
+        """Quita del índice los IDs que ya no tienen entradas en la caché (con self._lock tomado)"""
+        for user_id in list(self._sign_ids_by_user):
+            sign_ids = {
+                sign_id for sign_id in self._sign_ids_by_user[user_id]
+                if self.cache.contains(('sign', sign_id)) or self.cache.contains(('sign_with_user', sign_id))
+            }
+            if sign_ids:
+                self._sign_ids_by_user[user_id] = sign_ids
+            else:
+                del self._sign_ids_by_user[user_id]
+        self._indexed_sign_ids = sum(len(sign_ids) for sign_ids in self._sign_ids_by_user.values())
+
+    # Invalidación
+
+    def invalidate(self, sign_id: int) -> None:
+        self._evict_sign(sign_id)
+        TransactionService.after_commit(lambda: self._evict_sign(sign_id))
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._evict_user(user_id)
+        TransactionService.after_commit(lambda: self._evict_user(user_id))
+
+    def _evict_sign(self, sign_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self.cache.delete(('sign', sign_id))
+            self.cache.delete(('sign_with_user', sign_id))
+        if self._recently_invalidated is not None:
+            self._recently_invalidated.set(('sign', sign_id), True)
+
+    def _evict_user(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            sign_ids = self._sign_ids_by_user.pop(user_id, set())
+            self._indexed_sign_ids -= len(sign_ids)
+        if self._recently_invalidated is not None:
+            self._recently_invalidated.set(('user', user_id), True)
+        for sign_id in sign_ids:
+            self._evict_sign(sign_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de la caché"""
+        return self.cache.stats()
+
+    # Escrituras: se delegan e invalidan
+
+    def update(self, sign_id: int, **kwargs) -> Optional[Sign]:
+        updated_sign = self.repository.update(sign_id, **kwargs)
+        self.invalidate(sign_id)
+        return updated_sign
+
+    def soft_delete(self, sign_id: int) -> bool:
+        deleted = self.repository.soft_delete(sign_id)
+        self.invalidate(sign_id)
+        return deleted
+
+    def bump_user_versions(self, user_id: int) -> int:
+        # Se llama tras cambiar los datos del usuario, que forman parte de sus signos cacheados
+        updated = self.repository.bump_user_versions(user_id)
+        self.invalidate_user(user_id)
+        return updated
+
+    # Operaciones delegadas sin caché
+
+    def create(self, sign: Sign) -> Sign:
+        return self.repository.create(sign)
+
+    def create_many(self, signs: List[Sign]) -> List[Sign]:
+        return self.repository.create_many(signs)
+
+    def get_all_active(self) -> List[Sign]:
+        return self.repository.get_all_active()
+
+    def get_by_name(self, name: str) -> Optional[Sign]:
+        return self.repository.get_by_name(name)
+
+    def get_by_names(self, names: List[str]) -> List[Sign]:
+        return self.repository.get_by_names(names)
+
+    def get_all_active_with_users(self) -> List[Dict[str, Any]]:
+        return self.repository.get_all_active_with_users()
+
+    def get_active_with_users_page(self, limit: int, after_id: Optional[int] = None,
+                                   fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        return self.repository.get_active_with_users_page(limit, after_id, fields)
+
+    def stream_active_with_users(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        return self.repository.stream_active_with_users(batch_size)
+
+    def search_similar(self, name: str, limit: int, threshold: float) -> List[Dict[str, Any]]:
+        return self.repository.search_similar(name, limit, threshold)
+
+    def get_sound_alike(self, name: str, limit: int) -> List[Dict[str, Any]]:
+        return self.repository.get_sound_alike(name, limit)
+
+    def get_version(self, sign_id: int) -> Optional[int]:
+        return self.repository.get_version(sign_id)
+
+    def get_change_counter(self) -> int:
+        return self.repository.get_change_counter()
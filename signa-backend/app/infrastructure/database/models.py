@@ -1,3 +1,4 @@
+import datetime
 from flask_sqlalchemy import SQLAlchemy
 
 db = SQLAlchemy()
@@ -13,6 +14,11 @@ class User(db.Model):
     address = db.Column(db.String(100), nullable=False)
     status = db.Column(db.Boolean, default=True, nullable=False)  # True = activo, False = eliminado
 
+    __table_args__ = (
+        # Email único sin distinguir mayúsculas (también sirve a las búsquedas por lower(email))
+        db.Index('uq_users_email_lower', db.func.lower(email), unique=True),
+    )
+
     # Relación 1:1 con UserCredentials usando el mismo ID
     credentials = db.relationship('UserCredentials', backref='user', uselist=False, cascade='all, delete-orphan')
     
@@ -53,8 +59,18 @@ class Sign(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     sign_name = db.Column(db.String(100), nullable=False)  # Cambiado de 'name' a 'sign_name'
+    sign_name_phonetic = db.Column(db.String(200), nullable=True, index=True)  # Clave fonética de sign_name (marcas que suenan igual)
     userId = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     status = db.Column(db.Boolean, default=True, nullable=False)  # True = activo, False = eliminado
+    version = db.Column(db.Integer, default=1, server_default='1', nullable=False, index=True)  # Nuevo valor global con cada cambio de la marca o su usuario (ETag); max(version) = contador del listado
+
+    __table_args__ = (
+        # Nombre único entre las marcas activas sin distinguir mayúsculas
+        db.Index(
+            'uq_signs_sign_name_lower_active', db.func.lower(sign_name), unique=True,
+            postgresql_where=(status == True), sqlite_where=(status == True)
+        ),
+    )
 
     def to_dict(self):
         return {
@@ -63,3 +79,37 @@ class Sign(db.Model):
             'userId': self.userId,
             'status': self.status
         }
+
+class RevokedToken(db.Model):
+    """Modelo de base de datos para tokens JWT revocados (logout)"""
+    __tablename__ = 'revoked_tokens'
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(64), nullable=False, unique=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # Las filas vencidas se purgan
+    revoked_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow, index=True)  # Informativo (la sincronización usa el id)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'jti': self.jti,
+            'expires_at': self.expires_at.isoformat(),
+            'revoked_at': self.revoked_at.isoformat()
+        }
+
+class SchemaMigration(db.Model):
+    """Modelo de base de datos para el registro de migraciones aplicadas"""
+    __tablename__ = 'schema_migrations'
+
+    id = db.Column(db.String(100), primary_key=True)  # Id de la migración, p. ej. '001_create_admin_user'
+    checksum = db.Column(db.String(64), nullable=False)  # sha256 del código de la migración al aplicarse
+    applied_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
+    execution_ms = db.Column(db.Integer, nullable=False)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'checksum': self.checksum,
+            'applied_at': self.applied_at.isoformat(),
+            'execution_ms': self.execution_ms
+        }
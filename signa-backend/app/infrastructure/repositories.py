@@ -1,8 +1,111 @@
-from typing import List, Optional, Dict, Any
-from app.domain.repositories import UserRepository, UserCredentialsRepository, SignRepository
-from app.domain.entities import User, UserCredentials, Sign
-from .database.models import db, User as UserModel, UserCredentials as UserCredentialsModel, Sign as SignModel
+from typing import List, Optional, Dict, Any, Tuple, Iterator
+import time
+from functools import lru_cache
+from datetime import datetime
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
+from config import Config
+from app.domain.repositories import UserRepository, UserCredentialsRepository, SignRepository, RevokedTokenRepository
+from app.domain.entities import User, UserCredentials, Sign, RevokedToken
+from .database.models import db, User as UserModel, UserCredentials as UserCredentialsModel, Sign as SignModel, RevokedToken as RevokedTokenModel
 from ..utils.transaction_service import TransactionService
+from ..utils.trigram_index import get_sign_name_index
+from ..utils.phonetic import spanish_phonetic_key
+
+# Nombres con los que el motor reporta la violación de cada índice único (PostgreSQL / SQLite)
+EMAIL_UNIQUE_CONSTRAINTS = ('uq_users_email_lower', 'users_email_key', 'users.email')
+SIGN_NAME_UNIQUE_CONSTRAINTS = ('uq_signs_sign_name_lower_active',)
+
+def _flush_unique(session, constraints: Tuple[str, ...], message: str) -> None:
+    """
+    Hace flush traduciendo la violación de un índice único a ValueError (400 en los servicios).
+    La unicidad la garantiza la base de datos: no hace falta consultar antes de insertar.
+    """
+    try:
+        session.flush()
+    except IntegrityError as e:
+        if any(constraint in str(e.orig) for constraint in constraints):
+            raise ValueError(message) from e
+        raise
+
+class SignWithUserProjection:
+    """
+    Lectura de signos activos con su usuario como filas planas de columnas: el SELECT
+    trae solo las columnas de la respuesta y no se hidratan objetos ORM. Los diccionarios
+    {'sign': {...}, 'user': {...}} se arman por posición.
+    Con 'fields' ('sign.id', 'user.email', ...) solo se seleccionan esos campos; signs.id
+    se selecciona siempre en la primera posición (cursor del keyset).
+    """
+
+    COLUMNS = {
+        'sign': {
+            'id': SignModel.id,
+            'sign_name': SignModel.sign_name,
+            'status': SignModel.status
+        },
+        'user': {
+            'id': UserModel.id,
+            'name': UserModel.name,
+            'surname': UserModel.surname,
+            'email': UserModel.email,
+            'address': UserModel.address,
+            'status': UserModel.status
+        }
+    }
+
+    def __init__(self, fields: Optional[Tuple[str, ...]] = None):
+        selected = set(fields) if fields else None
+        self.columns = [SignModel.id]
+        self.sign_fields = []  # (posición, campo)
+        self.user_fields = []
+        for section, section_fields in (('sign', self.sign_fields), ('user', self.user_fields)):
+            for field, column in self.COLUMNS[section].items():
+                if selected is not None and f'{section}.{field}' not in selected:
+                    continue
+                if column is SignModel.id:
+                    section_fields.append((0, field))
+                    continue
+                section_fields.append((len(self.columns), field))
+                self.columns.append(column)
+
+    def select(self, *extra_columns):
+        """SELECT de las columnas con el JOIN y los filtros de activos (extra_columns van al final)"""
+        return select(*self.columns, *extra_columns).join_from(
+            SignModel, UserModel, SignModel.userId == UserModel.id
+        ).where(
+            SignModel.status == True,
+            UserModel.status == True
+        )
+
+    def to_dict(self, row) -> Dict[str, Any]:
+        result = {}
+        if self.sign_fields:
+            result['sign'] = {field: row[position] for position, field in self.sign_fields}
+        if self.user_fields:
+            result['user'] = {field: row[position] for position, field in self.user_fields}
+        return result
+
+SIGN_WITH_USER = SignWithUserProjection()
+
+@lru_cache(maxsize=128)
+def _sign_with_user_projection(fields: Optional[Tuple[str, ...]]) -> SignWithUserProjection:
+    """Proyección para un conjunto de campos (las combinaciones posibles son pocas: se reutilizan)"""
+    return SignWithUserProjection(fields) if fields else SIGN_WITH_USER
+
+# Secuencia de versiones de signos en PostgreSQL (migración 006)
+SIGN_VERSION_SEQUENCE = 'signs_version_seq'
+
+def _next_sign_version():
+    """
+    Versión para una escritura de signos (alta, edición, baja o cambio del usuario).
+    Sale de una fuente global creciente, así max(signs.version) cambia con cada escritura y
+    sirve de contador de cambios del listado con una lectura del índice ix_signs_version.
+    PostgreSQL usa una secuencia (las escrituras no comparten ninguna fila); SQLite, max + 1
+    (el motor ya serializa las escrituras).
+    """
+    if db.engine.dialect.name == 'postgresql':
+        return func.nextval(SIGN_VERSION_SEQUENCE)
+    return select(func.coalesce(func.max(SignModel.version), 0) + 1).scalar_subquery()
 
 class SQLAlchemyUserRepository(UserRepository):
     """Implementación concreta del repositorio de usuarios usando SQLAlchemy con transacciones"""
@@ -19,7 +122,7 @@ class SQLAlchemyUserRepository(UserRepository):
                 status=user.status
             )
             session.add(db_user)
-            session.flush()  # Para obtener el ID asignado
+            _flush_unique(session, EMAIL_UNIQUE_CONSTRAINTS, f"Ya existe un usuario con el email '{user.email}'")
             
             return User(
                 id=db_user.id,
@@ -32,11 +135,46 @@ class SQLAlchemyUserRepository(UserRepository):
         
         return TransactionService.execute_in_transaction(create_user_transaction)
 
+    def create_many(self, users: List[User]) -> List[User]:
+        """Crea varios usuarios en una sola transacción usando inserciones en lote"""
+        
+        def create_users_transaction(session):
+            db_users = [
+                UserModel(
+                    name=user.name,
+                    surname=user.surname,
+                    email=user.email,
+                    address=user.address,
+                    status=user.status
+                )
+                for user in users
+            ]
+            session.add_all(db_users)
+            # En PostgreSQL, SQLAlchemy agrupa los INSERT en sentencias multi-fila con RETURNING
+            _flush_unique(session, EMAIL_UNIQUE_CONSTRAINTS, "Ya existe un usuario con alguno de los emails del lote")
+            
+            return [
+                User(
+                    id=db_user.id,
+                    name=db_user.name,
+                    surname=db_user.surname,
+                    email=db_user.email,
+                    address=db_user.address,
+                    status=db_user.status
+                )
+                for db_user in db_users
+            ]
+        
+        return TransactionService.execute_in_transaction(create_users_transaction)
+
     def get_by_email(self, email: str) -> Optional[User]:
         """Obtiene un usuario por email usando transacciones de solo lectura"""
         
         def get_user_by_email_transaction(session):
-            db_user = session.query(UserModel).filter_by(email=email, status=True).first()
+            db_user = session.query(UserModel).filter(
+                func.lower(UserModel.email) == email.lower(),
+                UserModel.status == True
+            ).first()
             if not db_user:
                 return None
 
@@ -51,6 +189,31 @@ class SQLAlchemyUserRepository(UserRepository):
         
         return TransactionService.execute_read_only(get_user_by_email_transaction)
 
+    def get_by_emails(self, emails: List[str]) -> List[User]:
+        """Obtiene los usuarios activos con alguno de los emails (sin distinguir mayúsculas) usando una sola consulta IN"""
+        if not emails:
+            return []
+        
+        def get_users_by_emails_transaction(session):
+            db_users = session.query(UserModel).filter(
+                func.lower(UserModel.email).in_([email.lower() for email in emails]),
+                UserModel.status == True
+            ).all()
+            
+            return [
+                User(
+                    id=db_user.id,
+                    name=db_user.name,
+                    surname=db_user.surname,
+                    email=db_user.email,
+                    address=db_user.address,
+                    status=db_user.status
+                )
+                for db_user in db_users
+            ]
+        
+        return TransactionService.execute_read_only(get_users_by_emails_transaction)
+
     def update(self, user_id: int, **kwargs) -> Optional[User]:
         """Actualiza un usuario usando transacciones"""
         
@@ -64,7 +227,7 @@ class SQLAlchemyUserRepository(UserRepository):
                 if hasattr(db_user, key):
                     setattr(db_user, key, value)
             
-            session.flush()
+            _flush_unique(session, EMAIL_UNIQUE_CONSTRAINTS, f"Ya existe un usuario con el email '{db_user.email}'")
             
             return User(
                 id=db_user.id,
@@ -102,6 +265,34 @@ class SQLAlchemyUserCredentialsRepository(UserCredentialsRepository):
         
         return TransactionService.execute_in_transaction(create_credentials_transaction)
 
+    def create_many(self, credentials: List[UserCredentials]) -> List[UserCredentials]:
+        """Crea varias credenciales en una sola transacción usando inserciones en lote"""
+        
+        def create_credentials_list_transaction(session):
+            db_credentials_list = [
+                UserCredentialsModel(
+                    id=item.id,  # Mismo ID que el usuario
+                    username=item.username,
+                    password=item.password,
+                    status=item.status
+                )
+                for item in credentials
+            ]
+            session.add_all(db_credentials_list)
+            session.flush()
+            
+            return [
+                UserCredentials(
+                    id=db_credentials.id,
+                    username=db_credentials.username,
+                    password=db_credentials.password,
+                    status=db_credentials.status
+                )
+                for db_credentials in db_credentials_list
+            ]
+        
+        return TransactionService.execute_in_transaction(create_credentials_list_transaction)
+
     def get_by_username(self, username: str) -> Optional[UserCredentials]:
         """Obtiene credenciales por username usando transacciones de solo lectura"""
         
@@ -152,11 +343,13 @@ class SQLAlchemySignRepository(SignRepository):
         def create_sign_transaction(session):
             db_sign = SignModel(
                 sign_name=sign.sign_name,  # Cambiado de 'name' a 'sign_name'
+                sign_name_phonetic=spanish_phonetic_key(sign.sign_name),
                 userId=sign.user_id,
-                status=sign.status
+                status=sign.status,
+                version=_next_sign_version()
             )
             session.add(db_sign)
-            session.flush()
+            _flush_unique(session, SIGN_NAME_UNIQUE_CONSTRAINTS, f"Ya existe una marca con el nombre '{sign.sign_name}'")
             
             return Sign(
                 id=db_sign.id,
@@ -165,23 +358,60 @@ class SQLAlchemySignRepository(SignRepository):
                 status=db_sign.status
             )
         
-        return TransactionService.execute_in_transaction(create_sign_transaction)
+        created_sign = TransactionService.execute_in_transaction(create_sign_transaction)
+        self._update_similarity_index(created_sign.id, created_sign.sign_name)
+        return created_sign
 
-    def get_all_active(self) -> List[Sign]:
-        """Obtiene todos los signos activos usando transacciones de solo lectura"""
+    def create_many(self, signs: List[Sign]) -> List[Sign]:
+        """Crea varios signos en una sola transacción usando inserciones en lote"""
         
-        def get_all_active_signs_transaction(session):
-            db_signs = session.query(SignModel).filter_by(status=True).all()
+        def create_signs_transaction(session):
+            db_signs = [
+                SignModel(
+                    sign_name=sign.sign_name,
+                    sign_name_phonetic=spanish_phonetic_key(sign.sign_name),
+                    userId=sign.user_id,
+                    status=sign.status
+                )
+                for sign in signs
+            ]
+            session.add_all(db_signs)
+            # En PostgreSQL, SQLAlchemy agrupa los INSERT en sentencias multi-fila con RETURNING
+            _flush_unique(session, SIGN_NAME_UNIQUE_CONSTRAINTS, "Ya existe una marca con alguno de los nombres del lote")
+            if db_signs:
+                # Versiones en una sola sentencia: una expresión SQL por fila impediría agrupar los INSERT
+                session.query(SignModel).filter(SignModel.id.in_([db_sign.id for db_sign in db_signs])).update(
+                    {SignModel.version: _next_sign_version()}, synchronize_session=False
+                )
+            
             return [
                 Sign(
                     id=db_sign.id,
-                    sign_name=db_sign.sign_name,  # Cambiado de 'name' a 'sign_name'
+                    sign_name=db_sign.sign_name,
                     user_id=db_sign.userId,
                     status=db_sign.status
                 )
                 for db_sign in db_signs
             ]
         
+        created_signs = TransactionService.execute_in_transaction(create_signs_transaction)
+        for created_sign in created_signs:
+            self._update_similarity_index(created_sign.id, created_sign.sign_name)
+        return created_signs
+
+    def get_all_active(self) -> List[Sign]:
+        """Obtiene todos los signos activos usando transacciones de solo lectura"""
+        
+        def get_all_active_signs_transaction(session):
+            # Solo las columnas necesarias, sin hidratar objetos ORM
+            rows = session.execute(
+                select(SignModel.id, SignModel.sign_name, SignModel.userId, SignModel.status).where(SignModel.status == True)
+            ).all()
+            return [
+                Sign(id=row.id, sign_name=row.sign_name, user_id=row.userId, status=row.status)
+                for row in rows
+            ]
+        
         return TransactionService.execute_read_only(get_all_active_signs_transaction)
 
     def get_by_id(self, sign_id: int) -> Optional[Sign]:
@@ -205,7 +435,10 @@ class SQLAlchemySignRepository(SignRepository):
         """Obtiene un signo por nombre (solo activos) usando transacciones de solo lectura"""
         
         def get_sign_by_name_transaction(session):
-            db_sign = session.query(SignModel).filter_by(sign_name=sign_name, status=True).first()
+            db_sign = session.query(SignModel).filter(
+                func.lower(SignModel.sign_name) == sign_name.lower(),
+                SignModel.status == True
+            ).first()
             if not db_sign:
                 return None
 
@@ -218,6 +451,26 @@ class SQLAlchemySignRepository(SignRepository):
         
         return TransactionService.execute_read_only(get_sign_by_name_transaction)
 
+    def get_by_names(self, names: List[str]) -> List[Sign]:
+        """Obtiene los signos activos con alguno de los nombres (sin distinguir mayúsculas) usando una sola consulta IN"""
+        if not names:
+            return []
+        
+        def get_signs_by_names_transaction(session):
+            rows = session.execute(
+                select(SignModel.id, SignModel.sign_name, SignModel.userId, SignModel.status).where(
+                    func.lower(SignModel.sign_name).in_([name.lower() for name in names]),
+                    SignModel.status == True
+                )
+            ).all()
+            
+            return [
+                Sign(id=row.id, sign_name=row.sign_name, user_id=row.userId, status=row.status)
+                for row in rows
+            ]
+        
+        return TransactionService.execute_read_only(get_signs_by_names_transaction)
+
     def update(self, sign_id: int, **kwargs) -> Optional[Sign]:
         """Actualiza un signo usando transacciones"""
         
@@ -231,7 +484,12 @@ class SQLAlchemySignRepository(SignRepository):
                 if hasattr(db_sign, key):
                     setattr(db_sign, key, value)
             
-            session.flush()
+            if 'sign_name' in kwargs:
+                db_sign.sign_name_phonetic = spanish_phonetic_key(db_sign.sign_name)
+            
+            # Versión calculada en el UPDATE: dos actualizaciones concurrentes no comparten versión
+            db_sign.version = _next_sign_version()
+            _flush_unique(session, SIGN_NAME_UNIQUE_CONSTRAINTS, f"Ya existe una marca con el nombre '{kwargs.get('sign_name', '')}'")
             
             return Sign(
                 id=db_sign.id,
@@ -240,7 +498,10 @@ class SQLAlchemySignRepository(SignRepository):
                 status=db_sign.status
             )
         
-        return TransactionService.execute_in_transaction(update_sign_transaction)
+        updated_sign = TransactionService.execute_in_transaction(update_sign_transaction)
+        if updated_sign:
+            self._update_similarity_index(updated_sign.id, updated_sign.sign_name)
+        return updated_sign
 
     def soft_delete(self, sign_id: int) -> bool:
         """Elimina suavemente un signo (cambia status a False) usando transacciones"""
@@ -251,82 +512,257 @@ class SQLAlchemySignRepository(SignRepository):
                 return False
             
             db_sign.status = False
+            db_sign.version = _next_sign_version()
             session.flush()
             return True
         
-        return TransactionService.execute_in_transaction(soft_delete_sign_transaction)
+        deleted = TransactionService.execute_in_transaction(soft_delete_sign_transaction)
+        if deleted:
+            self._update_similarity_index(sign_id, None)
+        return deleted
 
     def get_all_active_with_users(self) -> List[Dict[str, Any]]:
-        """Obtiene todos los signos activos con información del usuario usando JOINs"""
+        """Obtiene todos los signos activos con información del usuario usando JOINs (filas planas, sin ORM)"""
         
         def get_all_active_with_users_transaction(session):
             # Consulta con JOIN para traer signos y usuarios en una sola operación
-            db_signs_with_users = session.query(
-                SignModel, UserModel
-            ).join(
-                UserModel, SignModel.userId == UserModel.id
-            ).filter(
-                SignModel.status == True,
-                UserModel.status == True
-            ).all()
-            
-            result = []
-            for db_sign, db_user in db_signs_with_users:
-                sign_info = {
-                    'sign': {
-                        'id': db_sign.id,
-                        'sign_name': db_sign.sign_name,
-                        'status': db_sign.status
-                    },
-                    'user': {
-                        'id': db_user.id,
-                        'name': db_user.name,
-                        'surname': db_user.surname,
-                        'email': db_user.email,
-                        'address': db_user.address,
-                        'status': db_user.status
-                    }
-                }
-                result.append(sign_info)
-            
-            return result
+            rows = session.execute(SIGN_WITH_USER.select()).all()
+            return [SIGN_WITH_USER.to_dict(row) for row in rows]
+        
+        return TransactionService.execute_read_only(get_all_active_with_users_transaction, replica=True)
+
+    def get_active_with_users_page(self, limit: int, after_id: Optional[int] = None,
+                                   fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Obtiene una página de signos activos con usuario usando paginación keyset sobre signs.id"""
+        projection = _sign_with_user_projection(fields)
+
+        def get_active_with_users_page_transaction(session):
+            # WHERE id > :after ORDER BY id LIMIT :limit + 1 usa el índice de la PK,
+            # por lo que el costo de cada página no depende de su profundidad
+            query = projection.select()
+
+            if after_id is not None:
+                query = query.where(SignModel.id > after_id)
+
+            # Se pide un registro extra para saber si existe una página siguiente
+            rows = session.execute(query.order_by(SignModel.id).limit(limit + 1)).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            result = [projection.to_dict(row) for row in rows]
+            last_id = rows[-1][0] if has_more else None
+            return result, last_id
+
+        return TransactionService.execute_read_only(get_active_with_users_page_transaction, replica=True)
+
+    def stream_active_with_users(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre todos los signos activos con usuario usando un cursor del lado del servidor.
+        Los registros se traen de a batch_size filas; nunca se materializa la lista completa.
+        """
         
-        return TransactionService.execute_read_only(get_all_active_with_users_transaction)
+        def stream_active_with_users_transaction(session):
+            # Mismo JOIN que get_all_active_with_users, pero con yield_per (stream_results)
+            query = SIGN_WITH_USER.select().order_by(SignModel.id)
 
-    def get_by_id_with_user(self, sign_id: int) -> Optional[Dict[str, Any]]:
-        """Obtiene un signo por ID con información del usuario usando JOIN"""
+            for row in session.execute(query, execution_options={'yield_per': batch_size}):
+                yield SIGN_WITH_USER.to_dict(row)
+        
+        return TransactionService.stream_read_only(stream_active_with_users_transaction, replica=True)
+
+    def get_by_id_with_user(self, sign_id: int, fields: Optional[Tuple[str, ...]] = None) -> Optional[Dict[str, Any]]:
+        """Obtiene un signo por ID con información del usuario usando JOIN (y la versión leída en la misma fila)"""
+        projection = _sign_with_user_projection(fields)
         
         def get_sign_by_id_with_user_transaction(session):
             # Consulta con JOIN para traer signo y usuario en una sola operación
-            db_result = session.query(
-                SignModel, UserModel
-            ).join(
-                UserModel, SignModel.userId == UserModel.id
-            ).filter(
+            row = session.execute(projection.select(SignModel.version).where(SignModel.id == sign_id)).first()
+            if not row:
+                return None
+            sign = projection.to_dict(row)
+            sign['version'] = row[-1]
+            return sign
+        
+        return TransactionService.execute_read_only(get_sign_by_id_with_user_transaction, replica=True)
+
+    def get_version(self, sign_id: int) -> Optional[int]:
+        """Obtiene la versión de un signo activo con una consulta por clave primaria (sin JOIN)"""
+        
+        def get_sign_version_transaction(session):
+            return session.query(SignModel.version).filter(
                 SignModel.id == sign_id,
-                SignModel.status == True,
-                UserModel.status == True
-            ).first()
+                SignModel.status == True
+            ).scalar()
+        
+        return TransactionService.execute_read_only(get_sign_version_transaction, replica=True)
+
+    def get_change_counter(self) -> int:
+        """Obtiene el contador de cambios de la colección de signos"""
+        
+        def get_change_counter_transaction(session):
+            # Lectura del extremo del índice ix_signs_version (no recorre la tabla)
+            return session.execute(select(func.max(SignModel.version))).scalar() or 0
+        
+        return TransactionService.execute_read_only(get_change_counter_transaction, replica=True)
+
+    def bump_user_versions(self, user_id: int) -> int:
+        """Incrementa la versión de los signos activos de un usuario (sus datos forman parte de la respuesta)"""
+        
+        def bump_user_versions_transaction(session):
+            return session.query(SignModel).filter(
+                SignModel.userId == user_id,
+                SignModel.status == True
+            ).update({SignModel.version: _next_sign_version()}, synchronize_session=False)
+        
+        return TransactionService.execute_in_transaction(bump_user_versions_transaction)
+
+    def search_similar(self, name: str, limit: int, threshold: float) -> List[Dict[str, Any]]:
+        """
+        Obtiene los signos activos más parecidos a 'name' por similitud de trigramas.
+        En PostgreSQL usa pg_trgm (índice GIN); en otros motores usa un índice invertido en memoria.
+        """
+        if db.engine.dialect.name == 'postgresql':
+            return self._search_similar_pg_trgm(name, limit, threshold)
+        return self._search_similar_in_memory(name, limit, threshold)
+
+    def _search_similar_pg_trgm(self, name: str, limit: int, threshold: float) -> List[Dict[str, Any]]:
+        """Búsqueda por similitud con pg_trgm: el operador % usa el índice GIN ix_signs_sign_name_trgm"""
+        
+        def search_similar_transaction(session):
+            # Umbral del operador % solo para esta transacción
+            session.execute(
+                text("SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"),
+                {'threshold': str(threshold)}
+            )
             
-            if not db_result:
-                return None
+            query_name = func.lower(name)
+            score = func.similarity(func.lower(SignModel.sign_name), query_name)
+            rows = session.execute(
+                SIGN_WITH_USER.select(score.label('similarity')).where(
+                    func.lower(SignModel.sign_name).op('%')(query_name)
+                ).order_by(
+                    score.desc(), SignModel.id
+                ).limit(limit)
+            ).all()
             
-            db_sign, db_user = db_result
+            return [self._similar_result(SIGN_WITH_USER.to_dict(row), row.similarity) for row in rows]
+        
+        return TransactionService.execute_read_only(search_similar_transaction, replica=True)
+
+    def _search_similar_in_memory(self, name: str, limit: int, threshold: float) -> List[Dict[str, Any]]:
+        """Búsqueda por similitud con el índice de trigramas en memoria (SQLite/desarrollo)"""
+        index = get_sign_name_index()
+        if index.built_at is None or time.monotonic() - index.built_at > Config.SIGN_SIMILARITY_INDEX_TTL_SECONDS:
+            index.build([(sign.id, sign.sign_name) for sign in self.get_all_active()])
+        
+        matches = index.search(name, limit, threshold)
+        if not matches:
+            return []
+        
+        def get_similar_signs_transaction(session):
+            rows = session.execute(
+                SIGN_WITH_USER.select().where(SignModel.id.in_([sign_id for sign_id, _ in matches]))
+            ).all()
+            
+            signs_by_id = {row[0]: SIGN_WITH_USER.to_dict(row) for row in rows}
+            return [
+                self._similar_result(signs_by_id[sign_id], similarity)
+                for sign_id, similarity in matches
+                if sign_id in signs_by_id
+            ]
+        
+        return TransactionService.execute_read_only(get_similar_signs_transaction, replica=True)
+
+    def get_sound_alike(self, name: str, limit: int) -> List[Dict[str, Any]]:
+        """Obtiene los signos activos cuyo nombre suena igual a 'name' (misma clave fonética, consulta indexada)"""
+        phonetic_key = spanish_phonetic_key(name)
+        if not phonetic_key:
+            return []
+        
+        def get_sound_alike_transaction(session):
+            rows = session.execute(
+                SIGN_WITH_USER.select().where(
+                    SignModel.sign_name_phonetic == phonetic_key
+                ).order_by(SignModel.id).limit(limit)
+            ).all()
+            return [SIGN_WITH_USER.to_dict(row) for row in rows]
+        
+        return TransactionService.execute_read_only(get_sound_alike_transaction, replica=True)
+
+    @staticmethod
+    def _similar_result(sign_with_user: Dict[str, Any], similarity) -> Dict[str, Any]:
+        sign_with_user['similarity'] = round(float(similarity), 4)
+        return sign_with_user
+
+    @staticmethod
+    def _update_similarity_index(sign_id: int, sign_name: Optional[str]) -> None:
+        """
+        Mantiene el índice de trigramas en memoria del proceso (solo si ya fue construido).
+        Se aplica tras el commit: si la unidad de trabajo hace rollback el índice no cambia.
+        """
+        TransactionService.after_commit(lambda: SQLAlchemySignRepository._apply_similarity_index_update(sign_id, sign_name))
+
+    @staticmethod
+    def _apply_similarity_index_update(sign_id: int, sign_name: Optional[str]) -> None:
+        """Agrega, reemplaza o quita (sign_name None) el signo del índice de trigramas, si ya fue construido"""
+        index = get_sign_name_index()
+        if index.built_at is None:
+            return
+        if sign_name is None:
+            index.remove(sign_id)
+        else:
+            index.add(sign_id, sign_name)
+
+class SQLAlchemyRevokedTokenRepository(RevokedTokenRepository):
+    """Implementación concreta del repositorio de tokens revocados usando SQLAlchemy con transacciones"""
+
+    def revoke(self, token: RevokedToken) -> RevokedToken:
+        """Registra un token como revocado usando transacciones (si ya estaba revocado lo retorna)"""
+        
+        def revoke_token_transaction(session):
+            db_token = session.query(RevokedTokenModel).filter_by(jti=token.jti).first()
+            if not db_token:
+                db_token = RevokedTokenModel(
+                    jti=token.jti,
+                    expires_at=token.expires_at
+                )
+                session.add(db_token)
+                session.flush()
             
-            return {
-                'sign': {
-                    'id': db_sign.id,
-                    'sign_name': db_sign.sign_name,
-                    'status': db_sign.status
-                },
-                'user': {
-                    'id': db_user.id,
-                    'name': db_user.name,
-                    'surname': db_user.surname,
-                    'email': db_user.email,
-                    'address': db_user.address,
-                    'status': db_user.status
-                }
-            }
-        
-        return TransactionService.execute_read_only(get_sign_by_id_with_user_transaction)
+            return RevokedToken(
+                id=db_token.id,
+                jti=db_token.jti,
+                expires_at=db_token.expires_at
+            )
+        
+        return TransactionService.execute_in_transaction(revoke_token_transaction)
+
+    def get_active_revoked_after(self, after_id: Optional[int], now: datetime) -> List[RevokedToken]:
+        """Obtiene los tokens revocados con id mayor que 'after_id' que aún no expiraron usando transacciones de solo lectura"""
+        
+        def get_active_revoked_after_transaction(session):
+            query = session.query(
+                RevokedTokenModel.id, RevokedTokenModel.jti, RevokedTokenModel.expires_at
+            ).filter(
+                RevokedTokenModel.expires_at > now
+            )
+            
+            if after_id is not None:
+                query = query.filter(RevokedTokenModel.id > after_id)
+            
+            return [
+                RevokedToken(id=row.id, jti=row.jti, expires_at=row.expires_at)
+                for row in query.order_by(RevokedTokenModel.id).all()
+            ]
+        
+        return TransactionService.execute_read_only(get_active_revoked_after_transaction)
+
+    def purge_expired(self, now: datetime) -> int:
+        """Elimina los tokens revocados ya expirados usando transacciones"""
+        
+        def purge_expired_transaction(session):
+            return session.query(RevokedTokenModel).filter(
+                RevokedTokenModel.expires_at <= now
+            ).delete(synchronize_session=False)
+        
+        return TransactionService.execute_in_transaction(purge_expired_transaction)
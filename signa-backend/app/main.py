@@ -2,12 +2,39 @@ from flask import Flask
 from .infrastructure.database.models import db
 from .infrastructure.api.auth.routes import auth_bp
 from .infrastructure.api.sign.routes import sign_bp
+from .infrastructure.api.ops.routes import ops_bp
 from .utils.cors_config import configure_cors
+from .utils.json_provider import FastJSONProvider, fast_json_available
+from .utils.db_pool import build_engine_options
+from .utils.read_replica import init_read_replica
+from .utils.server_timing import init_server_timing
+from .utils.metrics import init_metrics
+from .utils.slow_query_log import init_slow_query_log
 from config import Config
 
-def create_app():
+def create_app(use_read_replica: bool = True):
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(Config)
+    
+    # Réplica de lectura opcional (bind 'replica') para las lecturas de marcas
+    if use_read_replica and Config.DATABASE_REPLICA_URL:
+        init_read_replica(app, Config.DATABASE_REPLICA_URL, build_engine_options(Config, Config.DATABASE_REPLICA_URL))
+    
+    # Serialización JSON con orjson si está disponible
+    if Config.FAST_JSON_ENABLED and fast_json_available():
+        app.json = FastJSONProvider(app)
+    
+    # Desglose de tiempos por petición (Server-Timing, X-Query-Count y log de peticiones lentas)
+    if Config.SERVER_TIMING_ENABLED:
+        init_server_timing(app, Config.SLOW_REQUEST_THRESHOLD_MS)
+    
+    # Métricas de Prometheus (GET /metrics, sumadas entre los workers de Gunicorn)
+    init_metrics(app)
+    
+    # Consultas lentas con su origen y plan de ejecución (logs/slow_queries.jsonl)
+    if Config.SLOW_QUERY_LOG_ENABLED:
+        init_slow_query_log(Config)
     
     # Configurar CORS usando la configuración avanzada
     configure_cors(app)
@@ -15,15 +42,12 @@ def create_app():
     db.init_app(app)
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(sign_bp, url_prefix='/api/sign')
+    app.register_blueprint(ops_bp, url_prefix='/api/ops')
     
-    with app.app_context():
-        db.create_all()
-    
+    # Sin trabajo de base de datos al arrancar: el esquema se crea con las migraciones
+    # (python run_migrations.py) y las conexiones se abren con la primera petición
     return app
 
-# Crear la instancia de la app que Gunicorn necesita
-app = create_app()
-
-# Para desarrollo local
+# Para desarrollo local (Gunicorn usa la fábrica: app.main:create_app())
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
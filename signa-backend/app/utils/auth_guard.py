@@ -1,11 +1,16 @@
+import time
 from functools import wraps
 from flask import request, jsonify, g
 from .jwt_service import JWTService
+from .revocation_filter import get_revocation_filter
+from .server_timing import record_timing
 
 def require_auth(f):
     """Decorador para proteger rutas que requieren autenticación"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
+        started_at = time.perf_counter()
+        
         # Obtener token del header Authorization
         auth_header = request.headers.get('Authorization')
         
@@ -20,15 +25,20 @@ def require_auth(f):
         except ValueError:
             return jsonify({'error': 'Formato de autorización inválido. Use: Bearer <token>'}), 401
         
-        # Verificar token
-        payload = JWTService.verify_token(token)
+        # Verificar token (los tokens ya verificados se sirven desde caché hasta su expiración)
+        payload = JWTService.verify_token_cached(token)
         if not payload:
             return jsonify({'error': 'Token inválido o expirado'}), 401
         
+        # Verificar que el token no haya sido revocado (logout), sin consultar la base de datos
+        if get_revocation_filter().is_revoked(payload.get('jti')):
+            return jsonify({'error': 'Token revocado'}), 401
+        
         # Almacenar información del usuario en g para uso posterior
         g.user_id = payload.get('user_id')
         g.username = payload.get('username')
         g.user_data = payload
+        record_timing('auth', time.perf_counter() - started_at)
         
         return f(*args, **kwargs)
     
@@ -0,0 +1,33 @@
+import base64
+import json
+from typing import Optional
+
+class CursorService:
+    """Servicio para codificar/decodificar cursores opacos de paginación (keyset)"""
+
+    @staticmethod
+    def encode(last_id: int) -> str:
+        """Codifica el último ID de una página como cursor opaco"""
+        raw = json.dumps({'id': last_id}, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode(cursor: Optional[str]) -> Optional[int]:
+        """
+        Decodifica un cursor opaco y retorna el último ID visto.
+        Lanza ValueError si el cursor no es válido.
+        """
+        if not cursor:
+            return None
+
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            last_id = int(data['id'])
+        except Exception:
+            raise ValueError("Cursor de paginación inválido")
+
+        if last_id < 0:
+            raise ValueError("Cursor de paginación inválido")
+
+        return last_id
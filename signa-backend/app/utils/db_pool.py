@@ -0,0 +1,87 @@
+"""
+Pool de conexiones de SQLAlchemy configurable por entorno y con estadísticas
+
+Las opciones del engine (SQLALCHEMY_ENGINE_OPTIONS) se arman desde Config en
+create_app. El pool registra cuánto espera cada checkout, para distinguir un pool
+chico (esperas largas, timeouts) de consultas lentas.
+"""
+
+import os
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from .histogram import Histogram
+from .metrics import observe_pool_checkout
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mide la espera de cada checkout y cuenta los timeouts"""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = Histogram()
+        self.timeouts = 0
+
+    def _do_get(self):
+        # Incluye la espera por una conexión libre y, si hace falta, abrir una nueva
+        started_at = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - started_at
+            self.checkout_wait.observe(waited)
+            observe_pool_checkout(waited, timed_out)
+
+def build_engine_options(config, database_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Opciones del engine según la configuración (DB_POOL_*, DB_STATEMENT_TIMEOUT_MS)
+    para database_url (por defecto SQLALCHEMY_DATABASE_URI). SQLite en memoria conserva
+    el pool que elige Flask-SQLAlchemy; statement_timeout solo se aplica en PostgreSQL.
+    """
+    url = make_url(database_url or config.SQLALCHEMY_DATABASE_URI)
+    backend = url.get_backend_name()
+    options: Dict[str, Any] = {'pool_pre_ping': config.DB_POOL_PRE_PING}
+
+    if backend == 'sqlite' and url.database in (None, '', ':memory:'):
+        return options
+
+    options.update({
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': config.DB_POOL_SIZE,
+        'max_overflow': config.DB_POOL_MAX_OVERFLOW,
+        'pool_timeout': config.DB_POOL_TIMEOUT_SECONDS,
+        'pool_recycle': config.DB_POOL_RECYCLE_SECONDS
+    })
+
+    if backend == 'postgresql' and config.DB_STATEMENT_TIMEOUT_MS > 0:
+        options['connect_args'] = {'options': f'-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}'}
+
+    return options
+
+def pool_stats(engine) -> Dict[str, Any]:
+    """Estado del pool del proceso actual: conexiones en uso, libres, overflow y espera de checkout"""
+    pool = engine.pool
+    stats: Dict[str, Any] = {'pid': os.getpid(), 'pool': type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'idle': pool.checkedin(),
+            # overflow() es negativo mientras no se abrieron todas las conexiones de pool_size
+            'overflow': max(pool.overflow(), 0),
+            'max_overflow': pool._max_overflow,
+            'timeout_seconds': pool.timeout()
+        })
+
+    if isinstance(pool, InstrumentedQueuePool):
+        stats['timeouts'] = pool.timeouts
+        stats['checkout_wait_seconds'] = pool.checkout_wait.snapshot()
+
+    return stats
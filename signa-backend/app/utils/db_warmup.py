@@ -0,0 +1,36 @@
+import logging
+from ..infrastructure.database.models import db
+
+logger = logging.getLogger(__name__)
+
+def dispose_inherited_connections(app) -> None:
+    """
+    Tras el fork (gunicorn con preload_app): descarta las conexiones del pool heredadas
+    del master sin cerrarlas (siguen siendo del master) para que el worker abra las suyas
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+def warm_up_connection_pool(app, connections: int) -> int:
+    """
+    Abre 'connections' conexiones del pool y las devuelve, para que las primeras
+    peticiones del worker no paguen el handshake con la base de datos.
+    Un fallo solo se registra: el worker arranca igual y conecta bajo demanda.
+    Returns: número de conexiones abiertas
+    """
+    if connections <= 0:
+        return 0
+    
+    opened = []
+    try:
+        with app.app_context():
+            for _ in range(connections):
+                opened.append(db.engine.connect())
+    except Exception as e:
+        logger.warning("No se pudo precalentar el pool de conexiones: %s", e)
+    finally:
+        for connection in opened:
+            connection.close()
+    
+    return len(opened)
@@ -0,0 +1,106 @@
+"""
+Pool acotado para hashear y verificar contraseñas fuera del hilo de la petición
+
+bcrypt/argon2 consumen ~250 ms de CPU por operación. Limitar cuántas se ejecutan a
+la vez (y cuántas pueden esperar) evita que una ráfaga de logins deje sin CPU al
+resto de endpoints del worker: cuando el pool está saturado se falla rápido (503).
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from .histogram import Histogram
+from .server_timing import record_timing
+
+class HashingPoolSaturatedError(Exception):
+    """El pool de hashing no tiene capacidad (workers y cola llenos)"""
+    pass
+
+class HashingPool:
+    """Executor de tamaño fijo con límite de profundidad de cola y métricas de espera/ejecución"""
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._rejected = 0
+        self.queue_wait = Histogram()
+        self.execution = Histogram()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Los hilos no sobreviven a un fork (gunicorn preload): se crea un executor por proceso
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            with self._lock:
+                if self._executor is None or self._executor_pid != pid:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='hashing')
+                    self._executor_pid = pid
+        return self._executor
+
+    def submit(self, fn: Callable, *args: Any, block: bool = False) -> Future:
+        """
+        Encola fn(*args) en el pool.
+        Con block=False lanza HashingPoolSaturatedError si no hay capacidad;
+        con block=True espera a que se libere un lugar.
+        """
+        if not self._slots.acquire(blocking=block):
+            with self._lock:
+                self._rejected += 1
+            raise HashingPoolSaturatedError("Servicio de autenticación saturado, intente nuevamente")
+
+        submitted_at = time.perf_counter()
+
+        def task():
+            started_at = time.perf_counter()
+            self.queue_wait.observe(started_at - submitted_at)
+            try:
+                return fn(*args)
+            finally:
+                self.execution.observe(time.perf_counter() - started_at)
+
+        try:
+            future = self._get_executor().submit(task)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: Callable, *args: Any) -> Any:
+        """Ejecuta fn(*args) en el pool y espera el resultado (falla rápido si está saturado)"""
+        started_at = time.perf_counter()
+        try:
+            return self.submit(fn, *args).result()
+        finally:
+            # Espera del hilo de la petición (cola + ejecución) en Server-Timing 'hash'
+            record_timing('hash', time.perf_counter() - started_at)
+
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas del pool: capacidad, rechazos e histogramas de espera y ejecución"""
+        return {
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'rejected': self._rejected,
+            'queue_wait_seconds': self.queue_wait.snapshot(),
+            'execution_seconds': self.execution.snapshot()
+        }
+
+_hashing_pool: Optional[HashingPool] = None
+_hashing_pool_lock = threading.Lock()
+
+def get_hashing_pool() -> HashingPool:
+    """Obtiene el pool de hashing del proceso, creado desde Config la primera vez"""
+    global _hashing_pool
+    if _hashing_pool is None:
+        with _hashing_pool_lock:
+            if _hashing_pool is None:
+                from config import Config
+
+                _hashing_pool = HashingPool(Config.HASH_POOL_WORKERS, Config.HASH_POOL_MAX_QUEUE)
+    return _hashing_pool
@@ -0,0 +1,50 @@
+"""
+Proveedor JSON de Flask basado en orjson
+
+orjson es opcional: si no está instalado la aplicación usa el proveedor estándar
+de Flask (json de la biblioteca estándar). Se registra en create_app según
+Config.FAST_JSON_ENABLED.
+"""
+
+from typing import Any
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+def fast_json_available() -> bool:
+    """Indica si orjson está instalado"""
+    return orjson is not None
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Serializa con orjson (UTF-8 sin escapar, claves ordenadas si sort_keys).
+    Las llamadas con opciones propias del json estándar (indent, cls, ...) y las
+    respuestas con formato legible en modo debug usan el proveedor estándar.
+    """
+
+    def _options(self) -> int:
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -1,7 +1,13 @@
 import jwt
 import datetime
+import hashlib
+import time
+import uuid
 from typing import Optional, Dict, Any
 from flask import current_app
+from config import Config
+from .ttl_cache import TTLCache
+from .metrics import count_jwt_verification
 
 class JWTService:
     """Servicio para manejo de tokens JWT"""
@@ -15,14 +21,17 @@ class JWTService:
     # Tiempo de expiración del token (24 horas)
     ACCESS_TOKEN_EXPIRE_MINUTES = 24 * 60
     
+    # Caché de tokens verificados (ver verify_token_cached)
+    _verified_cache: Optional[TTLCache] = None
+    
     @classmethod
     def create_access_token(cls, data: Dict[str, Any]) -> str:
         """Crea un token de acceso JWT"""
         to_encode = data.copy()
         
-        # Agregar tiempo de expiración
+        # Agregar tiempo de expiración e identificador único (necesario para revocar en logout)
         expire = datetime.datetime.utcnow() + datetime.timedelta(minutes=cls.ACCESS_TOKEN_EXPIRE_MINUTES)
-        to_encode.update({"exp": expire})
+        to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
         
         # Crear token
         encoded_jwt = jwt.encode(to_encode, cls.SECRET_KEY, algorithm=cls.ALGORITHM)
@@ -31,6 +40,13 @@ class JWTService:
     @classmethod
     def verify_token(cls, token: str) -> Optional[Dict[str, Any]]:
         """Verifica y decodifica un token JWT"""
+        payload = cls._decode_token(token)
+        count_jwt_verification('valid' if payload else 'invalid')
+        return payload
+    
+    @classmethod
+    def _decode_token(cls, token: str) -> Optional[Dict[str, Any]]:
+        """Decodifica un token JWT verificando firma y expiración (None si no es válido)"""
         try:
             # Decodificar token
             payload = jwt.decode(token, cls.SECRET_KEY, algorithms=[cls.ALGORITHM])
@@ -44,13 +60,50 @@ class JWTService:
         except jwt.ExpiredSignatureError:
             # Token expirado
             return None
-        except jwt.JWTError:
+        except jwt.InvalidTokenError:
             # Token inválido
             return None
         except Exception:
             # Otros errores
             return None
     
+    @classmethod
+    def get_verified_cache(cls) -> TTLCache:
+        """Obtiene la caché de tokens ya verificados (creada desde Config la primera vez)"""
+        if cls._verified_cache is None:
+            cls._verified_cache = TTLCache(Config.JWT_CACHE_MAX_ENTRIES, Config.JWT_CACHE_TTL_SECONDS)
+        return cls._verified_cache
+    
+    @classmethod
+    def verify_token_cached(cls, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Verifica un token usando una caché de tokens ya verificados.
+        La clave es un digest del token y cada entrada vence a más tardar en el 'exp' del token,
+        así que un acierto evita la verificación de firma sin extender la vida del token.
+        """
+        if not Config.JWT_CACHE_ENABLED:
+            return cls.verify_token(token)
+        
+        cache = cls.get_verified_cache()
+        key = hashlib.sha256(token.encode('utf-8')).digest()
+        
+        payload = cache.get(key)
+        if payload is not None:
+            count_jwt_verification('cached')
+            return dict(payload)
+        
+        payload = cls.verify_token(token)
+        if payload:
+            cache.set(key, payload, ttl_seconds=payload['exp'] - time.time())
+            return dict(payload)
+        
+        return None
+    
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        """Contadores de la caché de tokens verificados"""
+        return cls.get_verified_cache().stats()
+    
     @classmethod
     def get_user_id_from_token(cls, token: str) -> Optional[int]:
         """Extrae el user_id del token JWT"""
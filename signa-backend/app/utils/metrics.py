@@ -0,0 +1,152 @@
+"""
+Métricas en formato Prometheus (GET /metrics)
+
+Latencia y códigos de estado por ruta, espera de checkout del pool de conexiones,
+commits/rollbacks de TransactionService, duración de hash/verify de contraseñas y
+verificaciones de JWT.
+
+Con varios workers de Gunicorn cada proceso escribe sus valores en archivos mmap de
+PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py lo fija antes de cargar la aplicación) y
+/metrics suma los de todos los procesos, responda el worker que responda. Sin esa
+variable (servidor de desarrollo) las métricas son las del proceso.
+
+prometheus_client es opcional: si no está instalado (o METRICS_ENABLED=False) las
+funciones de registro no hacen nada y /metrics no se expone.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+from flask import Flask, Response, request
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - depende del entorno
+    prometheus_client = None
+
+logger = logging.getLogger(__name__)
+
+MULTIPROCESS_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+# Buckets (segundos): peticiones y consultas de milisegundos; bcrypt/argon2 de cientos de ms
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+PASSWORD_HASH_BUCKETS = (0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5)
+
+def metrics_available() -> bool:
+    """Indica si prometheus_client está instalado"""
+    return prometheus_client is not None
+
+class Metrics:
+    """Métricas de la aplicación (una instancia por proceso, registrada en el registro por defecto)"""
+
+    def __init__(self):
+        self.request_duration = prometheus_client.Histogram(
+            'signa_http_request_duration_seconds', 'Duración de las peticiones HTTP por ruta',
+            ['method', 'route'], buckets=REQUEST_BUCKETS
+        )
+        self.responses = prometheus_client.Counter(
+            'signa_http_responses_total', 'Respuestas HTTP por ruta y código de estado',
+            ['method', 'route', 'status']
+        )
+        self.pool_checkout_wait = prometheus_client.Histogram(
+            'signa_db_pool_checkout_wait_seconds', 'Espera por una conexión del pool (incluye abrirla)',
+            buckets=POOL_WAIT_BUCKETS
+        )
+        self.pool_timeouts = prometheus_client.Counter(
+            'signa_db_pool_timeouts_total', 'Checkouts que superaron DB_POOL_TIMEOUT_SECONDS'
+        )
+        self.transactions = prometheus_client.Counter(
+            'signa_db_transactions_total', 'Transacciones de TransactionService por resultado',
+            ['outcome']
+        )
+        self.password_hashing = prometheus_client.Histogram(
+            'signa_password_hashing_seconds', 'Duración de hash/verify de contraseñas (sin la espera en cola)',
+            ['operation', 'algorithm'], buckets=PASSWORD_HASH_BUCKETS
+        )
+        self.jwt_verifications = prometheus_client.Counter(
+            'signa_jwt_verifications_total', 'Verificaciones de tokens JWT por resultado',
+            ['result']
+        )
+
+_metrics: Optional[Metrics] = None
+_metrics_initialized = False
+_metrics_lock = threading.Lock()
+
+def get_metrics() -> Optional[Metrics]:
+    """Obtiene las métricas del proceso (None si están desactivadas o falta prometheus_client)"""
+    global _metrics, _metrics_initialized
+    if not _metrics_initialized:
+        with _metrics_lock:
+            if not _metrics_initialized:
+                from config import Config
+
+                if Config.METRICS_ENABLED and metrics_available():
+                    _metrics = Metrics()
+                _metrics_initialized = True
+    return _metrics
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.request_duration.labels(method, route).observe(seconds)
+        metrics.responses.labels(method, route, str(status)).inc()
+
+def observe_pool_checkout(seconds: float, timed_out: bool) -> None:
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.pool_checkout_wait.observe(seconds)
+        if timed_out:
+            metrics.pool_timeouts.inc()
+
+def count_transaction(outcome: str) -> None:
+    """outcome: 'commit' o 'rollback'"""
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.transactions.labels(outcome).inc()
+
+def observe_password_hashing(operation: str, algorithm: str, seconds: float) -> None:
+    """operation: 'hash' o 'verify'"""
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.password_hashing.labels(operation, algorithm).observe(seconds)
+
+def count_jwt_verification(result: str) -> None:
+    """result: 'valid', 'invalid' o 'cached' (acierto de la caché de tokens verificados)"""
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.jwt_verifications.labels(result).inc()
+
+def render_metrics() -> Response:
+    """Métricas en formato de texto de Prometheus (sumadas entre procesos si hay PROMETHEUS_MULTIPROC_DIR)"""
+    if os.environ.get(MULTIPROCESS_DIR_ENV):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return Response(prometheus_client.generate_latest(registry), content_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+def init_metrics(app: Flask) -> None:
+    """Mide cada petición por ruta y expone GET /metrics (sin efecto si las métricas están desactivadas)"""
+    if get_metrics() is None:
+        if not metrics_available():
+            logger.warning("⚠️  prometheus_client no está instalado: /metrics desactivado")
+        return
+
+    @app.before_request
+    def start_request_metrics():
+        request.environ['signa.metrics_started_at'] = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response: Response) -> Response:
+        started_at = request.environ.get('signa.metrics_started_at')
+        if started_at is not None:
+            # La regla de la ruta (no la URL) mantiene acotada la cantidad de series
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            observe_request(request.method, route, response.status_code, time.perf_counter() - started_at)
+        return response
+
+    app.add_url_rule('/metrics', 'metrics', render_metrics, methods=['GET'])
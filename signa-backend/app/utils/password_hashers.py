@@ -0,0 +1,175 @@
+"""
+Hashers de contraseñas intercambiables (bcrypt y argon2id)
+
+Cada hasher reconoce sus propios hashes por el prefijo, de modo que conviven
+hashes de distintos algoritmos y costos en la misma tabla de credenciales.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+class PasswordHasher(ABC):
+    """Interfaz abstracta para un algoritmo de hash de contraseñas"""
+
+    algorithm: str = ''
+    prefixes: Tuple[str, ...] = ()
+
+    def identifies(self, hashed_password: str) -> bool:
+        """Indica si el hash fue generado por este algoritmo (según su prefijo)"""
+        return hashed_password.startswith(self.prefixes)
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        """Hashea una contraseña con los parámetros actuales"""
+        pass
+
+    @abstractmethod
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Verifica una contraseña contra su hash"""
+        pass
+
+    @abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Indica si el hash fue generado con parámetros distintos a los actuales"""
+        pass
+
+class BcryptHasher(PasswordHasher):
+    """Hasher bcrypt con número de rounds configurable"""
+
+    algorithm = 'bcrypt'
+    prefixes = ('$2a$', '$2b$', '$2y$')
+
+    def __init__(self, rounds: int = 12):
+        self.rounds = rounds
+
+    def hash(self, password: str) -> str:
+        import bcrypt
+
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        import bcrypt
+
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+        except Exception:
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # Formato: $2b$<rounds>$<salt+hash>
+        try:
+            return int(hashed_password.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+class Argon2idHasher(PasswordHasher):
+    """Hasher argon2id (argon2-cffi) con costo de tiempo, memoria y paralelismo configurables"""
+
+    algorithm = 'argon2id'
+    prefixes = ('$argon2id$',)
+
+    def __init__(self, time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 4):
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+        self._hasher = None
+
+    @property
+    def hasher(self):
+        # argon2-cffi se importa solo cuando se usa este algoritmo
+        if self._hasher is None:
+            from argon2 import PasswordHasher as Argon2PasswordHasher, Type
+
+            self._hasher = Argon2PasswordHasher(
+                time_cost=self.time_cost,
+                memory_cost=self.memory_cost,
+                parallelism=self.parallelism,
+                type=Type.ID
+            )
+        return self._hasher
+
+    def hash(self, password: str) -> str:
+        return self.hasher.hash(password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        try:
+            return self.hasher.verify(hashed_password, password)
+        except Exception:
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        try:
+            return self.hasher.check_needs_rehash(hashed_password)
+        except Exception:
+            return True
+
+class PasswordHasherRegistry:
+    """Registro de hashers: el primero es el algoritmo por defecto para hashes nuevos"""
+
+    def __init__(self, hashers: List[PasswordHasher], default_algorithm: str):
+        self.hashers: Dict[str, PasswordHasher] = {hasher.algorithm: hasher for hasher in hashers}
+        if default_algorithm not in self.hashers:
+            raise ValueError(f"Algoritmo de hash desconocido: '{default_algorithm}'")
+        self.default = self.hashers[default_algorithm]
+
+    def identify(self, hashed_password: str) -> Optional[PasswordHasher]:
+        """Obtiene el hasher que generó el hash (por prefijo) o None si no se reconoce"""
+        for hasher in self.hashers.values():
+            if hasher.identifies(hashed_password):
+                return hasher
+        return None
+
+def build_registry_from_config() -> PasswordHasherRegistry:
+    """Construye el registro de hashers a partir de Config"""
+    from config import Config
+
+    return PasswordHasherRegistry(
+        hashers=[
+            BcryptHasher(rounds=Config.BCRYPT_LOG_ROUNDS),
+            Argon2idHasher(
+                time_cost=Config.ARGON2_TIME_COST,
+                memory_cost=Config.ARGON2_MEMORY_COST,
+                parallelism=Config.ARGON2_PARALLELISM
+            )
+        ],
+        default_algorithm=Config.PASSWORD_HASHER
+    )
+
+def measure_hash_ms(hasher: PasswordHasher, samples: int = 3) -> float:
+    """Mide la latencia mediana (ms) de hashear una contraseña con el hasher dado"""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash('calibration-password')
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def calibrate_bcrypt(target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> Tuple[int, float]:
+    """
+    Elige el mayor número de rounds de bcrypt cuya latencia no supera target_ms en este host.
+    Retorna (rounds, latencia_ms). Nunca baja de min_rounds.
+    """
+    best = (min_rounds, measure_hash_ms(BcryptHasher(min_rounds)))
+    for rounds in range(min_rounds + 1, max_rounds + 1):
+        elapsed = measure_hash_ms(BcryptHasher(rounds))
+        if elapsed > target_ms:
+            break
+        best = (rounds, elapsed)
+    return best
+
+def calibrate_argon2id(target_ms: float, memory_cost: int, parallelism: int,
+                       min_time_cost: int = 2, max_time_cost: int = 20) -> Tuple[int, float]:
+    """
+    Con memoria y paralelismo fijos, elige el mayor time_cost de argon2id cuya latencia
+    no supera target_ms en este host. Retorna (time_cost, latencia_ms).
+    """
+    best = (min_time_cost, measure_hash_ms(Argon2idHasher(min_time_cost, memory_cost, parallelism)))
+    for time_cost in range(min_time_cost + 1, max_time_cost + 1):
+        elapsed = measure_hash_ms(Argon2idHasher(time_cost, memory_cost, parallelism))
+        if elapsed > target_ms:
+            break
+        best = (time_cost, elapsed)
+    return best
@@ -1,9 +1,40 @@
 import secrets
 import string
-import bcrypt
+import time
+from typing import Callable, List, Optional
+from .hashing_pool import get_hashing_pool, HashingPoolSaturatedError
+from .server_timing import record_timing
+from .metrics import observe_password_hashing
+from .password_hashers import PasswordHasher, PasswordHasherRegistry, build_registry_from_config
 
 class PasswordService:
-    """Servicio para manejo seguro de contraseñas usando bcrypt"""
+    """Servicio para manejo seguro de contraseñas (bcrypt o argon2id, según configuración)"""
+    
+    # Registro de hashers, construido desde Config la primera vez que se usa
+    _registry: Optional[PasswordHasherRegistry] = None
+    
+    @classmethod
+    def get_registry(cls) -> PasswordHasherRegistry:
+        """Obtiene el registro de hashers (algoritmo por defecto + algoritmos reconocidos)"""
+        if cls._registry is None:
+            cls._registry = build_registry_from_config()
+        return cls._registry
+    
+    @classmethod
+    def configure(cls, registry: PasswordHasherRegistry) -> None:
+        """Reemplaza el registro de hashers (por ejemplo, tras calibrar)"""
+        cls._registry = registry
+    
+    @staticmethod
+    def _measured(operation: str, hasher: PasswordHasher, fn: Callable) -> Callable:
+        """Envuelve fn para registrar su duración en las métricas (se ejecuta en el hilo del pool)"""
+        def measured(*args):
+            started_at = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                observe_password_hashing(operation, hasher.algorithm, time.perf_counter() - started_at)
+        return measured
     
     @staticmethod
     def generate_random_password(length: int = 12) -> str:
@@ -14,34 +45,59 @@ class PasswordService:
     
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hashea una contraseña usando bcrypt"""
-        # Convertir password a bytes y generar salt
-        password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt(rounds=12)  # 12 rounds es muy seguro
-        
-        # Generar hash
-        hashed = bcrypt.hashpw(password_bytes, salt)
-        
-        # Retornar como string
-        return hashed.decode('utf-8')
+        """
+        Hashea una contraseña con el algoritmo y costo configurados.
+        Se ejecuta en el pool de hashing; lanza HashingPoolSaturatedError si está saturado.
+        """
+        hasher = PasswordService.get_registry().default
+        return get_hashing_pool().run(PasswordService._measured('hash', hasher, hasher.hash), password)
     
     @staticmethod
-    def verify_password(password: str, hashed_password: str) -> bool:
-        """Verifica si una contraseña coincide con su hash"""
+    def hash_passwords(passwords: List[str]) -> List[str]:
+        """
+        Hashea varias contraseñas en paralelo usando el pool de hashing.
+        Envía como máximo max_workers a la vez, para dejar la cola libre a los logins.
+        Lanza HashingPoolSaturatedError si el pool está saturado (como hash_password), en
+        lugar de esperar detrás de los logins. Retorna los hashes en el mismo orden de entrada.
+        """
+        pool = get_hashing_pool()
+        hasher = PasswordService.get_registry().default
+        hash_fn = PasswordService._measured('hash', hasher, hasher.hash)
+        hashed = []
+        started_at = time.perf_counter()
         try:
-            password_bytes = password.encode('utf-8')
-            hashed_bytes = hashed_password.encode('utf-8')
-            return bcrypt.checkpw(password_bytes, hashed_bytes)
-        except Exception:
+            for start in range(0, len(passwords), pool.max_workers):
+                chunk = passwords[start:start + pool.max_workers]
+                futures = []
+                try:
+                    for password in chunk:
+                        futures.append(pool.submit(hash_fn, password))
+                except HashingPoolSaturatedError:
+                    # Los hashes ya encolados del lote no sirven: se cancelan los que no empezaron
+                    for future in futures:
+                        future.cancel()
+                    raise
+                hashed.extend(future.result() for future in futures)
+        finally:
+            record_timing('hash', time.perf_counter() - started_at)
+        return hashed
+
+    @staticmethod
+    def verify_password(password: str, hashed_password: str) -> bool:
+        """
+        Verifica si una contraseña coincide con su hash (el algoritmo se detecta por el prefijo).
+        Se ejecuta en el pool de hashing; lanza HashingPoolSaturatedError si está saturado.
+        """
+        hasher = PasswordService.get_registry().identify(hashed_password)
+        if not hasher:
             return False
+        return get_hashing_pool().run(PasswordService._measured('verify', hasher, hasher.verify), password, hashed_password)
     
     @staticmethod
     def needs_rehash(hashed_password: str) -> bool:
-        """Verifica si un hash necesita ser regenerado (por cambios en configuración)"""
-        # bcrypt no tiene un método directo para esto, pero podemos verificar los rounds
-        try:
-            hashed_bytes = hashed_password.encode('utf-8')
-            # Si los rounds son menores a 12, necesita rehash
-            return bcrypt.get_parameter_count(hashed_bytes) < 12
-        except Exception:
+        """Verifica si un hash necesita ser regenerado (otro algoritmo u otro costo que el configurado)"""
+        registry = PasswordService.get_registry()
+        hasher = registry.identify(hashed_password)
+        if hasher is not registry.default:
             return True
+        return hasher.needs_rehash(hashed_password)
@@ -0,0 +1,92 @@
+"""
+Clave fonética para nombres en español
+
+Codificación estilo Metaphone adaptada al español, con plegado de acentos y
+mayúsculas: "Kafé" y "Café" producen la misma clave ("KF"), de modo que la
+búsqueda de marcas que suenan igual es una comparación exacta sobre un índice.
+"""
+
+import re
+import unicodedata
+
+_VOWELS = frozenset('aeiou')
+_WORD_RE = re.compile(r'[a-zñ0-9]+')
+
+def _fold(text: str) -> str:
+    """Minúsculas y sin acentos ni diéresis, conservando la ñ"""
+    text = text.lower().replace('ñ', '\0')
+    text = ''.join(
+        char for char in unicodedata.normalize('NFD', text)
+        if not unicodedata.combining(char)
+    )
+    return text.replace('\0', 'ñ')
+
+def _encode_word(word: str) -> str:
+    codes = []
+    last = None
+    i = 0
+    length = len(word)
+
+    while i < length:
+        char = word[i]
+        next_char = word[i + 1] if i + 1 < length else ''
+        step = 1
+        code = None
+
+        if char in _VOWELS or (char == 'y' and next_char not in _VOWELS):
+            # Las vocales solo cuentan al inicio de la clave ('y' sin vocal detrás suena como 'i')
+            if not codes:
+                code = 'I' if char == 'y' else char.upper()
+            last = None
+            if code:
+                codes.append(code)
+            i += 1
+            continue
+        elif char in 'bvw':
+            code = 'B'
+        elif char == 'c':
+            if next_char == 'h':
+                code, step = 'X', 2
+            elif next_char in ('e', 'i'):
+                code = 'S'
+            else:
+                code = 'K'
+        elif char == 'g':
+            code = 'J' if next_char in ('e', 'i') else 'G'
+        elif char == 'h':
+            code = None  # Muda
+        elif char == 'l':
+            if next_char == 'l':
+                code, step = 'Y', 2
+            else:
+                code = 'L'
+        elif char == 'p':
+            if next_char == 'h':
+                code, step = 'F', 2
+            else:
+                code = 'P'
+        elif char in 'kq':
+            code = 'K'
+        elif char in 'sz':
+            code = 'S'
+        elif char == 'x':
+            code = 'S' if not codes else 'KS'
+        elif char == 'y':
+            code = 'Y'
+        elif char == 'ñ':
+            code = 'NY'
+        else:
+            code = char.upper()  # d, f, j, m, n, r, t y dígitos
+
+        if code and code != last:
+            codes.append(code)
+        if code:
+            last = code
+        i += step
+
+    return ''.join(codes)
+
+def spanish_phonetic_key(text: str) -> str:
+    """Obtiene la clave fonética de un texto (palabras codificadas separadas por espacio)"""
+    words = (_encode_word(word) for word in _WORD_RE.findall(_fold(text or '')))
+    return ' '.join(word for word in words if word)
@@ -0,0 +1,120 @@
+"""
+Réplica de lectura opcional (SQLALCHEMY_BINDS['replica'])
+
+Las lecturas que lo piden (execute_read_only(..., replica=True)) usan una sesión
+sobre el engine de la réplica, salvo cuando deben ver escrituras recientes:
+- dentro de una unidad de trabajo,
+- si la petición actual ya escribió en el primario,
+- si el usuario autenticado escribió hace menos de DB_READ_YOUR_WRITES_SECONDS
+  (registro por worker: una petición atendida por otro worker puede leer la réplica).
+Si la réplica falla, las lecturas vuelven al primario durante DB_REPLICA_RETRY_SECONDS.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+from flask import Flask, g, has_app_context, has_request_context
+from sqlalchemy.orm import Session
+from .ttl_cache import TTLCache
+from ..infrastructure.database.models import db
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND_KEY = 'replica'
+
+class ReadReplicaRouter:
+    """Decide si una lectura puede ir a la réplica y lleva el estado de disponibilidad"""
+
+    def __init__(self, read_your_writes_seconds: float, retry_seconds: float, max_tracked_users: int = 10000):
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.retry_seconds = retry_seconds
+        # user_id -> True mientras sus lecturas deban ir al primario
+        self._recent_writers = TTLCache(max_tracked_users, read_your_writes_seconds)
+        self._unavailable_until = 0.0
+        self._lock = threading.Lock()
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+
+    @staticmethod
+    def configured() -> bool:
+        """Indica si la aplicación actual tiene una réplica configurada"""
+        return has_app_context() and REPLICA_BIND_KEY in db.engines
+
+    def available(self) -> bool:
+        return time.monotonic() >= self._unavailable_until
+
+    def should_use_replica(self) -> bool:
+        """Indica si la lectura actual puede ir a la réplica"""
+        if not self.configured() or not self.available():
+            return False
+        if has_request_context():
+            if g.get('wrote_primary'):
+                return False
+            user_id = g.get('user_id')
+            if user_id is not None and self._recent_writers.get(user_id):
+                return False
+        return True
+
+    def record_write(self) -> None:
+        """Registra un commit en el primario: el resto de la petición y del usuario lee del primario"""
+        if not has_request_context():
+            return
+        g.wrote_primary = True
+        user_id = g.get('user_id')
+        if user_id is not None and self.read_your_writes_seconds > 0:
+            self._recent_writers.set(user_id, True)
+
+    def session(self) -> Session:
+        """Sesión de la réplica del contexto actual (se cierra al terminar el contexto)"""
+        session = g.get('replica_session')
+        if session is None:
+            session = Session(bind=db.engines[REPLICA_BIND_KEY])
+            g.replica_session = session
+        with self._lock:
+            self.replica_reads += 1
+        return session
+
+    def mark_unavailable(self, error: Exception) -> None:
+        """Deja de usar la réplica durante retry_seconds y descarta la sesión del contexto"""
+        with self._lock:
+            self._unavailable_until = time.monotonic() + self.retry_seconds
+            self.primary_fallbacks += 1
+        close_replica_session()
+        logger.warning("⚠️ Réplica de lectura no disponible, se usa el primario por %ss: %s", self.retry_seconds, error)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores del enrutamiento de lecturas"""
+        return {
+            'available': self.available(),
+            'replica_reads': self.replica_reads,
+            'primary_fallbacks': self.primary_fallbacks,
+            'read_your_writes_seconds': self.read_your_writes_seconds
+        }
+
+def close_replica_session(exception: Optional[BaseException] = None) -> None:
+    """Cierra la sesión de la réplica del contexto actual, si se abrió"""
+    session = g.pop('replica_session', None)
+    if session is not None:
+        session.close()
+
+def init_read_replica(app: Flask, replica_url: str, engine_options: Dict[str, Any]) -> None:
+    """Registra la réplica como bind 'replica' (llamar antes de db.init_app)"""
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    binds[REPLICA_BIND_KEY] = {'url': replica_url, **engine_options}
+    app.config['SQLALCHEMY_BINDS'] = binds
+    app.teardown_appcontext(close_replica_session)
+
+_router: Optional[ReadReplicaRouter] = None
+_router_lock = threading.Lock()
+
+def get_read_replica_router() -> ReadReplicaRouter:
+    """Obtiene el enrutador de lecturas del proceso, creado desde Config la primera vez"""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                from config import Config
+
+                _router = ReadReplicaRouter(Config.DB_READ_YOUR_WRITES_SECONDS, Config.DB_REPLICA_RETRY_SECONDS)
+    return _router
@@ -0,0 +1,196 @@
+"""
+Filtro en memoria de tokens JWT revocados (logout)
+
+La fuente de verdad es la tabla revoked_tokens. Cada worker mantiene un filtro
+Bloom compacto y un conjunto exacto jti -> exp, sincronizados de forma incremental
+(por id, sin depender de relojes) como máximo cada REVOCATION_SYNC_INTERVAL_SECONDS y
+con una carga completa cada REVOCATION_FULL_SYNC_INTERVAL_SECONDS, que recupera las filas
+con id menor cuyo commit llegó después de la sincronización. Así require_auth
+resuelve la verificación en memoria: el Bloom descarta en O(1) los tokens no
+revocados y el conjunto exacto confirma los positivos (sin falsos positivos).
+"""
+
+import datetime
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Dict, Optional
+from app.domain.entities import RevokedToken
+from app.domain.repositories import RevokedTokenRepository
+from .transaction_service import TransactionService
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    """Filtro Bloom sobre un bytearray (sin falsos negativos)"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _indexes(self, item: str):
+        # Doble hashing (Kirsch-Mitzenmacher): un solo digest genera los k índices
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        for index in self._indexes(item):
+            self._bits[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(item))
+
+class RevocationFilter:
+    """Filtro de revocación por worker: Bloom + conjunto exacto, sincronizado desde la base de datos"""
+
+    def __init__(self, repository: RevokedTokenRepository, capacity: int, error_rate: float, sync_interval_seconds: float,
+                 full_sync_interval_seconds: float):
+        self.repository = repository
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval_seconds = sync_interval_seconds
+        self.full_sync_interval_seconds = full_sync_interval_seconds
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._exact: Dict[str, float] = {}  # jti -> exp (epoch UTC)
+        self._expired_since_rebuild = 0
+        self._last_id: Optional[int] = None  # Mayor id sincronizado
+        self._last_sync: Optional[datetime.datetime] = None
+        self._next_sync_at = 0.0
+        self._next_full_sync_at = 0.0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """Indica si el token fue revocado (verificación en memoria)"""
+        if not jti:
+            return False
+
+        self._maybe_sync()
+
+        if jti not in self._bloom:
+            return False
+
+        expires_at = self._exact.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def revoke(self, jti: str, exp: float) -> None:
+        """Revoca un token: lo registra en la base de datos y en el filtro local"""
+        expires_at = datetime.datetime.utcfromtimestamp(exp)
+
+        self.repository.revoke(RevokedToken(id=None, jti=jti, expires_at=expires_at))
+
+        with self._lock:
+            self._add(jti, exp)
+
+    def sync(self) -> None:
+        """
+        Trae las revocaciones nuevas (id mayor que el último sincronizado) y descarta las expiradas.
+        Periódicamente hace una carga completa: un id se asigna al insertar pero la fila se ve
+        al hacer commit, así que una revocación con id menor puede aparecer después. La carga
+        completa también purga de la tabla las filas vencidas.
+        """
+        now = datetime.datetime.utcnow()
+        full = self._last_id is None or time.monotonic() >= self._next_full_sync_at
+
+        if full:
+            self._next_full_sync_at = time.monotonic() + self.full_sync_interval_seconds
+            try:
+                self.repository.purge_expired(now)
+            except Exception as e:
+                logger.warning(f"⚠️  No se pudieron purgar los tokens revocados expirados: {str(e)}")
+
+        tokens = self.repository.get_active_revoked_after(None if full else self._last_id, now)
+
+        with self._lock:
+            # Las revocaciones no se deshacen: la carga completa solo agrega (las expiradas se descartan)
+            for token in tokens:
+                self._add(token.jti, token.expires_at.replace(tzinfo=datetime.timezone.utc).timestamp())
+            self._drop_expired()
+
+        if tokens:
+            self._last_id = max(self._last_id or 0, tokens[-1].id)
+        elif self._last_id is None:
+            self._last_id = 0
+        self._last_sync = now
+
+    def stats(self) -> Dict[str, float]:
+        """Tamaño del filtro y estado de la sincronización"""
+        return {
+            'revoked_tokens': len(self._exact),
+            'bloom_bits': self._bloom.size,
+            'bloom_hashes': self._bloom.hash_count,
+            'last_id': self._last_id,
+            'last_sync': self._last_sync.isoformat() if self._last_sync else None
+        }
+
+    def _maybe_sync(self) -> None:
+        now = time.monotonic()
+        if now < self._next_sync_at:
+            return
+
+        # Un solo hilo sincroniza; el resto sigue respondiendo con el filtro actual
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_sync_at = now + self.sync_interval_seconds
+            self.sync()
+        except Exception as e:
+            logger.warning(f"⚠️  No se pudo sincronizar el filtro de revocación: {str(e)}")
+        finally:
+            self._sync_lock.release()
+
+    def _add(self, jti: str, exp: float) -> None:
+        if jti in self._exact:
+            return
+        self._exact[jti] = exp
+        if len(self._exact) > self._bloom.capacity:
+            self._rebuild_bloom()
+        else:
+            self._bloom.add(jti)
+
+    def _drop_expired(self) -> None:
+        now = time.time()
+        expired = [jti for jti, exp in self._exact.items() if exp <= now]
+        for jti in expired:
+            del self._exact[jti]
+
+        # Los bits de los expirados solo generan falsos positivos (el conjunto exacto los descarta);
+        # se reconstruye el Bloom cuando son una fracción importante
+        self._expired_since_rebuild += len(expired)
+        if self._expired_since_rebuild > max(1000, len(self._exact) // 4):
+            self._rebuild_bloom()
+
+    def _rebuild_bloom(self) -> None:
+        bloom = BloomFilter(max(self.capacity, len(self._exact) * 2), self.error_rate)
+        for jti in self._exact:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._expired_since_rebuild = 0
+
+_revocation_filter: Optional[RevocationFilter] = None
+_revocation_filter_lock = threading.Lock()
+
+def get_revocation_filter() -> RevocationFilter:
+    """Obtiene el filtro de revocación del proceso, creado desde Config la primera vez"""
+    global _revocation_filter
+    if _revocation_filter is None:
+        with _revocation_filter_lock:
+            if _revocation_filter is None:
+                from config import Config
+                from ..infrastructure.repositories import SQLAlchemyRevokedTokenRepository
+
+                _revocation_filter = RevocationFilter(
+                    SQLAlchemyRevokedTokenRepository(),
+                    Config.REVOCATION_BLOOM_CAPACITY,
+                    Config.REVOCATION_BLOOM_ERROR_RATE,
+                    Config.REVOCATION_SYNC_INTERVAL_SECONDS,
+                    Config.REVOCATION_FULL_SYNC_INTERVAL_SECONDS
+                )
+    return _revocation_filter
@@ -0,0 +1,115 @@
+"""
+Desglose de tiempos por petición (opcional, SERVER_TIMING_ENABLED)
+
+Agrega a cada respuesta el header Server-Timing con auth, db, hash, serialize y total
+(en ms) y X-Query-Count con las consultas SQL ejecutadas, y registra una línea JSON
+para las peticiones que superan SLOW_REQUEST_THRESHOLD_MS.
+
+Desactivado no se registra ningún hook ni evento: record_timing() solo lee un
+ContextVar vacío.
+"""
+
+import json
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+from flask import Flask, Response, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Orden de las métricas en el header (además de las registradas aparecen en este orden)
+TIMING_NAMES = ('auth', 'db', 'hash', 'serialize')
+
+class RequestTiming:
+    """Tiempos acumulados de una petición (segundos) y consultas ejecutadas"""
+
+    __slots__ = ('started_at', 'durations', 'queries')
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.queries = 0
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def header(self, total: float) -> str:
+        metrics = []
+        for name in TIMING_NAMES:
+            if name in self.durations:
+                metrics.append(f'{name};dur={self.durations[name] * 1000:.2f}')
+        metrics.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(metrics)
+
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar('request_timing', default=None)
+
+def record_timing(name: str, seconds: float) -> None:
+    """Suma 'seconds' a la métrica 'name' de la petición actual (no hace nada si está desactivado)"""
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_timing.get() is not None:
+        conn.info.setdefault('server_timing_started_at', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = _current_timing.get()
+    started = conn.info.get('server_timing_started_at')
+    if timing is not None and started:
+        timing.add('db', time.perf_counter() - started.pop())
+        timing.queries += 1
+
+def init_server_timing(app: Flask, slow_request_threshold_ms: float) -> None:
+    """Registra los hooks de la petición, los eventos del engine y la medición de la serialización"""
+
+    @app.before_request
+    def start_request_timing():
+        request.environ['signa.timing_token'] = _current_timing.set(RequestTiming())
+
+    @app.after_request
+    def add_server_timing_headers(response: Response) -> Response:
+        timing = _current_timing.get()
+        if timing is None:
+            return response
+
+        total = time.perf_counter() - timing.started_at
+        response.headers['Server-Timing'] = timing.header(total)
+        response.headers['X-Query-Count'] = str(timing.queries)
+
+        if total * 1000 >= slow_request_threshold_ms:
+            logger.warning("🐢 Petición lenta: %s", json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                'total_ms': round(total * 1000, 2),
+                **{f'{name}_ms': round(seconds * 1000, 2) for name, seconds in timing.durations.items()},
+                'queries': timing.queries
+            }))
+        return response
+
+    @app.teardown_request
+    def reset_request_timing(exception=None):
+        token = request.environ.pop('signa.timing_token', None)
+        if token is not None:
+            _current_timing.reset(token)
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    # Serialización: el proveedor JSON de la aplicación (jsonify) medido como 'serialize'
+    json_response = app.json.response
+
+    def timed_json_response(*args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return json_response(*args, **kwargs)
+        finally:
+            record_timing('serialize', time.perf_counter() - started_at)
+
+    app.json.response = timed_json_response
@@ -0,0 +1,265 @@
+"""
+Registro de consultas lentas (opcional, SLOW_QUERY_LOG_ENABLED)
+
+Las consultas que superan SLOW_QUERY_THRESHOLD_MS se escriben como una línea JSON en
+un archivo por proceso derivado de SLOW_QUERY_LOG_FILE (logs/slow_queries.<pid>.jsonl,
+rotado por tamaño; los workers no comparten archivo ni rotación): SQL, parámetros, duración, el método del
+repositorio que la originó (p. ej. SQLAlchemySignRepository.get_all_active_with_users)
+y, para una fracción de ellas (SLOW_QUERY_EXPLAIN_SAMPLE_RATE), el plan de ejecución:
+EXPLAIN (FORMAT JSON) en PostgreSQL, EXPLAIN QUERY PLAN en SQLite.
+
+El EXPLAIN corre en la misma conexión y transacción que la consulta, dentro de un
+SAVEPOINT para que un error no deje la transacción abortada. ANALYZE
+(SLOW_QUERY_EXPLAIN_ANALYZE) vuelve a ejecutar la consulta, así que solo se aplica a SELECT.
+
+Para revisar los archivos (combinados por fecha): python slow_queries.py
+"""
+
+import datetime
+import glob
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional, Tuple
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Módulos cuyos métodos se reportan como origen de la consulta
+REPOSITORY_MODULES = ('app.infrastructure.repositories',)
+# Sufijo de las funciones internas que los repositorios pasan a TransactionService
+TRANSACTION_FUNCTION_SUFFIX = '_transaction'
+
+# Sentencias con plan de ejecución (el DDL y los comandos de transacción no tienen)
+EXPLAINABLE_STATEMENTS = ('select', 'with', 'insert', 'update', 'delete')
+
+# Parámetros que nunca se escriben en el archivo
+REDACTED_PARAMETERS = ('password',)
+MAX_PARAMETER_LENGTH = 200
+
+def process_log_file(log_file: str, pid: int) -> str:
+    """Archivo del proceso: logs/slow_queries.jsonl -> logs/slow_queries.<pid>.jsonl"""
+    root, extension = os.path.splitext(log_file)
+    return f'{root}.{pid}{extension}'
+
+def find_repository_origin() -> Optional[str]:
+    """
+    Método del repositorio que ejecuta la consulta, recorriendo la pila desde el frame actual.
+    Las funciones internas '<método>_transaction' se reportan con el nombre del método.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_globals.get('__name__') in REPOSITORY_MODULES and 'self' in frame.f_locals:
+            name = frame.f_code.co_name
+            if name.endswith(TRANSACTION_FUNCTION_SUFFIX):
+                name = name[:-len(TRANSACTION_FUNCTION_SUFFIX)]
+            return f"{type(frame.f_locals['self']).__name__}.{name}"
+        frame = frame.f_back
+    return None
+
+def _format_parameter(key: Any, value: Any) -> Any:
+    if isinstance(key, str) and any(redacted in key.lower() for redacted in REDACTED_PARAMETERS):
+        return '<redacted>'
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = str(value)
+    return text if len(text) <= MAX_PARAMETER_LENGTH else text[:MAX_PARAMETER_LENGTH] + '...'
+
+def format_parameters(parameters: Any, names: Optional[Tuple[str, ...]] = None) -> Any:
+    """
+    Parámetros serializables en JSON (valores largos recortados, contraseñas ocultas).
+    'names' son los nombres de los parámetros posicionales (SQLite), para poder ocultarlos.
+    """
+    if isinstance(parameters, dict):
+        return {key: _format_parameter(key, value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if names is None or len(names) != len(parameters):
+            names = (None,) * len(parameters)
+        return [_format_parameter(name, value) for name, value in zip(names, parameters)]
+    return _format_parameter(None, parameters)
+
+class SlowQueryRecorder:
+    """Eventos del engine que miden cada consulta y registran las que superan el umbral"""
+
+    STARTED_AT_KEY = 'slow_query_started_at'
+
+    def __init__(self, threshold_ms: float, explain_sample_rate: float, explain_analyze: bool,
+                 log_file: str, max_bytes: int, backup_count: int):
+        self.threshold_seconds = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_analyze = explain_analyze
+        self.log_file = log_file
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.records = logging.getLogger('signa.slow_queries')
+        self.records.setLevel(logging.INFO)
+        self.records.propagate = False
+        self._handler_pid: Optional[int] = None
+        self._handler_lock = threading.Lock()
+
+    def _ensure_handler(self) -> None:
+        """
+        Abre el archivo del proceso actual. Se resuelve al escribir y no al iniciar: con
+        preload_app los workers heredan el recorder del master y cada uno necesita el suyo.
+        """
+        pid = os.getpid()
+        if self._handler_pid == pid:
+            return
+
+        with self._handler_lock:
+            if self._handler_pid == pid:
+                return
+            for handler in list(self.records.handlers):
+                self.records.removeHandler(handler)
+                handler.close()
+
+            path = process_log_file(self.log_file, pid)
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.records.addHandler(handler)
+            self._handler_pid = pid
+
+    def listen(self) -> None:
+        if not event.contains(Engine, 'before_cursor_execute', self.before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', self.before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self.after_cursor_execute)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(self.STARTED_AT_KEY, []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get(self.STARTED_AT_KEY)
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        if elapsed < self.threshold_seconds:
+            return
+
+        try:
+            self.record(conn, context, statement, parameters, executemany, elapsed)
+        except Exception as e:
+            # El registro nunca debe hacer fallar la consulta
+            logger.warning(f"⚠️  No se pudo registrar la consulta lenta: {str(e)}")
+
+    def record(self, conn, context, statement: str, parameters: Any, executemany: bool, elapsed: float) -> None:
+        compiled = getattr(context, 'compiled', None)
+        positional_names = getattr(compiled, 'positiontup', None)
+        entry: Dict[str, Any] = {
+            'timestamp': datetime.datetime.utcnow().isoformat(timespec='milliseconds') + 'Z',
+            'duration_ms': round(elapsed * 1000, 2),
+            'origin': find_repository_origin(),
+            'database': conn.dialect.name,
+            'statement': statement,
+            'parameters': format_parameters(parameters, positional_names),
+            'executemany': executemany,
+            'pid': os.getpid()
+        }
+        if has_request_context():
+            entry['request'] = f'{request.method} {request.path}'
+
+        explainable = statement.lstrip().lower().startswith(EXPLAINABLE_STATEMENTS)
+        if explainable and not executemany and random.random() < self.explain_sample_rate:
+            entry['plan'] = self.explain(conn, statement, parameters)
+
+        self._ensure_handler()
+        self.records.info(json.dumps(entry, ensure_ascii=False, default=str))
+
+    def explain(self, conn, statement: str, parameters: Any) -> Any:
+        """Plan de la consulta en la misma transacción (un error queda registrado en lugar del plan)"""
+        dialect = conn.dialect.name
+        is_select = statement.lstrip().lower().startswith(('select', 'with'))
+
+        if dialect == 'postgresql':
+            options = 'ANALYZE, BUFFERS, FORMAT JSON' if self.explain_analyze and is_select else 'FORMAT JSON'
+            explain_statement = f'EXPLAIN ({options}) {statement}'
+        elif dialect == 'sqlite':
+            explain_statement = f'EXPLAIN QUERY PLAN {statement}'
+        else:
+            return {'error': f'EXPLAIN no soportado para {dialect}'}
+
+        # Cursor propio: el de la consulta todavía tiene las filas que el ORM va a leer
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute('SAVEPOINT slow_query_explain')
+            try:
+                cursor.execute(explain_statement, parameters)
+                rows = cursor.fetchall()
+            except Exception as e:
+                cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+                return {'error': str(e)}
+            finally:
+                cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+        finally:
+            cursor.close()
+
+        if dialect == 'postgresql':
+            plan = rows[0][0]
+            return json.loads(plan) if isinstance(plan, str) else plan
+        return [{'id': row[0], 'parent': row[1], 'detail': row[3]} for row in rows]
+
+_recorder: Optional[SlowQueryRecorder] = None
+
+def init_slow_query_log(config) -> SlowQueryRecorder:
+    """Registra los eventos del engine según la configuración (SLOW_QUERY_*), una vez por proceso"""
+    global _recorder
+    if _recorder is not None:
+        return _recorder
+
+    _recorder = SlowQueryRecorder(
+        threshold_ms=config.SLOW_QUERY_THRESHOLD_MS,
+        explain_sample_rate=config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+        explain_analyze=config.SLOW_QUERY_EXPLAIN_ANALYZE,
+        log_file=config.SLOW_QUERY_LOG_FILE,
+        max_bytes=config.SLOW_QUERY_LOG_MAX_BYTES,
+        backup_count=config.SLOW_QUERY_LOG_BACKUP_COUNT
+    )
+    _recorder.listen()
+    return _recorder
+
+def _log_file_with_rotations(path: str) -> List[str]:
+    """El archivo y sus rotaciones (.1, .2, ...) que existan"""
+    paths = [path] if os.path.exists(path) else []
+    index = 1
+    while os.path.exists(f'{path}.{index}'):
+        paths.append(f'{path}.{index}')
+        index += 1
+    return paths
+
+def read_slow_query_log(log_file: str) -> List[Dict[str, Any]]:
+    """
+    Entradas de los archivos de todos los procesos (<archivo>.<pid>, incluidos los de workers
+    ya terminados) y de sus rotaciones, combinadas de la más vieja a la más nueva
+    """
+    root, extension = os.path.splitext(log_file)
+    process_files = [
+        path for path in glob.glob(f'{glob.escape(root)}.*{glob.escape(extension)}')
+        if path[len(root) + 1:len(path) - len(extension)].isdigit()
+    ]
+
+    paths = []
+    for path in sorted(process_files) + [log_file]:
+        paths.extend(_log_file_with_rotations(path))
+
+    entries = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    entries.sort(key=lambda entry: entry.get('timestamp', ''))
+    return entries
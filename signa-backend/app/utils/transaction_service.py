@@ -1,22 +1,113 @@
 from contextlib import contextmanager
-from typing import Generator, Any, Callable
+from typing import Generator, Any, Callable, Iterator
 from flask import current_app
 from ..infrastructure.database.models import db
-from sqlalchemy.exc import SQLAlchemyError
+from .read_replica import get_read_replica_router
+from .metrics import count_transaction
+from sqlalchemy.exc import SQLAlchemyError, DBAPIError, TimeoutError as PoolTimeoutError
 import logging
 
 logger = logging.getLogger(__name__)
 
+class ReplicaUnavailableError(Exception):
+    """
+    La réplica no responde: no se pudo obtener una conexión o se perdió durante la consulta
+    (las lecturas vuelven al primario). Timeouts de sentencia, bloqueos o cancelaciones no
+    cuentan: la réplica responde y el error se propaga tal cual.
+    """
+    pass
+
+def _is_connection_lost(error: SQLAlchemyError) -> bool:
+    """Error a mitad de consulta por conexión caída (según el dialecto, is_disconnect)"""
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
 class TransactionService:
     """Servicio para manejo de transacciones de base de datos (similar a QueryRunner de TypeORM)"""
     
+    # Clave en session.info con la profundidad de la unidad de trabajo activa
+    UNIT_OF_WORK_DEPTH_KEY = 'unit_of_work_depth'
+    
+    # Clave en session.info con las funciones a ejecutar tras el commit de la unidad de trabajo
+    AFTER_COMMIT_KEY = 'unit_of_work_after_commit'
+    
+    @staticmethod
+    def in_unit_of_work() -> bool:
+        """Indica si hay una unidad de trabajo abierta en la sesión actual"""
+        return db.session.info.get(TransactionService.UNIT_OF_WORK_DEPTH_KEY, 0) > 0
+    
+    @staticmethod
+    def after_commit(callback: Callable[[], None]) -> None:
+        """
+        Ejecuta 'callback' cuando los cambios ya están confirmados: al hacer commit la unidad
+        de trabajo abierta (se descarta si hay rollback) o de inmediato si no hay ninguna.
+        """
+        if TransactionService.in_unit_of_work():
+            db.session.info.setdefault(TransactionService.AFTER_COMMIT_KEY, []).append(callback)
+        else:
+            callback()
+    
+    @staticmethod
+    @contextmanager
+    def unit_of_work() -> Generator[Any, None, None]:
+        """
+        Context manager para una unidad de trabajo (un caso de uso = un commit).
+        Las llamadas a transaction() dentro de ella se unen a la transacción externa
+        en lugar de hacer commit; el commit (o rollback) se hace una sola vez al salir.
+        Si ya hay una unidad de trabajo abierta, esta se une a la existente.
+        
+        Uso:
+            with TransactionService.unit_of_work():
+                user = user_repository.create(user)
+                sign_repository.create(sign)
+                # Un solo COMMIT al salir del bloque
+        """
+        session = db.session
+        key = TransactionService.UNIT_OF_WORK_DEPTH_KEY
+        depth = session.info.get(key, 0)
+        
+        if depth > 0:
+            # Unidad de trabajo anidada: se une a la externa
+            session.info[key] = depth + 1
+            try:
+                yield session
+            finally:
+                session.info[key] = depth
+            return
+        
+        session.info[key] = 1
+        try:
+            logger.info("🚀 Iniciando unidad de trabajo")
+            yield session
+            
+            session.commit()
+            count_transaction('commit')
+            get_read_replica_router().record_write()
+            logger.info("✅ Unidad de trabajo completada exitosamente")
+            
+        except Exception as e:
+            session.rollback()
+            count_transaction('rollback')
+            session.info.pop(TransactionService.AFTER_COMMIT_KEY, None)
+            logger.error(f"❌ Error en unidad de trabajo, rollback ejecutado: {str(e)}")
+            raise
+            
+        finally:
+            session.info.pop(key, None)
+        
+        for callback in session.info.pop(TransactionService.AFTER_COMMIT_KEY, []):
+            callback()
+    
     @staticmethod
     @contextmanager
-    def transaction() -> Generator[Any, None, None]:
+    def transaction(savepoint: bool = False) -> Generator[Any, None, None]:
         """
         Context manager para transacciones automáticas.
         Similar al QueryRunner de TypeORM.
         
+        Dentro de una unidad de trabajo no hace commit: se une a la transacción externa.
+        Con savepoint=True los cambios de este bloque se aíslan en un SAVEPOINT, de modo
+        que un error solo revierte este bloque y no toda la unidad de trabajo.
+        
         Uso:
             with TransactionService.transaction() as session:
                 # Hacer operaciones en la transacción
@@ -26,33 +117,54 @@ class TransactionService:
                 # Si hay excepción, se hace rollback automático
         """
         session = db.session
+        
+        if TransactionService.in_unit_of_work():
+            if savepoint:
+                with session.begin_nested():
+                    yield session
+            else:
+                yield session
+            return
+        
         try:
             logger.info("🚀 Iniciando transacción de base de datos")
             yield session
             
             # Si llegamos aquí, no hubo excepciones, hacer commit
             session.commit()
+            count_transaction('commit')
+            get_read_replica_router().record_write()
             logger.info("✅ Transacción completada exitosamente")
             
         except SQLAlchemyError as e:
             # Error de base de datos, hacer rollback
             session.rollback()
+            count_transaction('rollback')
             logger.error(f"❌ Error en transacción, rollback ejecutado: {str(e)}")
             raise
             
         except Exception as e:
             # Otro tipo de error, hacer rollback
             session.rollback()
+            count_transaction('rollback')
             logger.error(f"❌ Error inesperado en transacción, rollback ejecutado: {str(e)}")
             raise
     
     @staticmethod
     @contextmanager
-    def read_only_transaction() -> Generator[Any, None, None]:
+    def read_only_transaction(replica: bool = False) -> Generator[Any, None, None]:
         """
         Context manager para transacciones de solo lectura.
         Útil para consultas que no modifican datos.
+        
+        Con replica=True usa la réplica de lectura si está configurada y la lectura no
+        necesita ver escrituras recientes (ver app/utils/read_replica.py).
         """
+        if replica and TransactionService._use_replica():
+            with TransactionService._replica_transaction() as session:
+                yield session
+            return
+        
         session = db.session
         try:
             logger.info("📖 Iniciando transacción de solo lectura")
@@ -66,13 +178,47 @@ class TransactionService:
             raise
     
     @staticmethod
-    def execute_in_transaction(operation: Callable) -> Any:
+    def _use_replica() -> bool:
+        # Dentro de una unidad de trabajo se lee del primario para ver los cambios propios
+        return not TransactionService.in_unit_of_work() and get_read_replica_router().should_use_replica()
+    
+    @staticmethod
+    @contextmanager
+    def _replica_transaction() -> Generator[Any, None, None]:
+        """Transacción de solo lectura en la réplica; al terminar devuelve la conexión al pool"""
+        router = get_read_replica_router()
+        session = router.session()
+        try:
+            # La conexión se pide antes de la operación: cualquier fallo aquí es de disponibilidad
+            try:
+                session.connection()
+            except (DBAPIError, PoolTimeoutError) as e:
+                router.mark_unavailable(e)
+                raise ReplicaUnavailableError(str(e)) from e
+            
+            logger.info("📖 Iniciando transacción de solo lectura en la réplica")
+            yield session
+            logger.info("✅ Transacción de solo lectura en la réplica completada")
+            
+        except SQLAlchemyError as e:
+            if _is_connection_lost(e):
+                router.mark_unavailable(e)
+                raise ReplicaUnavailableError(str(e)) from e
+            logger.error(f"❌ Error en transacción de solo lectura en la réplica: {str(e)}")
+            raise
+            
+        finally:
+            session.rollback()
+    
+    @staticmethod
+    def execute_in_transaction(operation: Callable, savepoint: bool = False) -> Any:
         """
         Ejecuta una operación dentro de una transacción.
         Similar al execute() del QueryRunner de TypeORM.
         
         Args:
             operation: Función que contiene la lógica de la transacción
+            savepoint: Usar un SAVEPOINT si se ejecuta dentro de una unidad de trabajo
             
         Returns:
             Resultado de la operación
@@ -80,23 +226,56 @@ class TransactionService:
         Raises:
             Exception: Si la transacción falla
         """
-        with TransactionService.transaction() as session:
+        with TransactionService.transaction(savepoint=savepoint) as session:
             return operation(session)
     
     @staticmethod
-    def execute_read_only(operation: Callable) -> Any:
+    def execute_read_only(operation: Callable, replica: bool = False) -> Any:
         """
         Ejecuta una operación de solo lectura dentro de una transacción.
         
         Args:
             operation: Función que contiene la lógica de consulta
+            replica: Permitir leer de la réplica (si no responde, se repite en el primario)
             
         Returns:
             Resultado de la consulta
         """
+        if replica and TransactionService._use_replica():
+            try:
+                with TransactionService._replica_transaction() as session:
+                    return operation(session)
+            except ReplicaUnavailableError:
+                pass  # La réplica quedó marcada como no disponible: se repite en el primario
+        
         with TransactionService.read_only_transaction() as session:
             return operation(session)
     
+    @staticmethod
+    def stream_read_only(operation: Callable, replica: bool = False) -> Iterator[Any]:
+        """
+        Versión de execute_read_only para lecturas por streaming: 'operation(session)' retorna
+        un iterador que se recorre dentro de la transacción.
+        
+        Si la réplica no responde antes de la primera fila se repite en el primario; después
+        el error se propaga (las filas ya entregadas no se pueden repetir).
+        """
+        if replica and TransactionService._use_replica():
+            started = False
+            try:
+                with TransactionService._replica_transaction() as session:
+                    for item in operation(session):
+                        started = True
+                        yield item
+                return
+            except ReplicaUnavailableError as e:
+                if started:
+                    raise e.__cause__
+                # La réplica quedó marcada como no disponible: se repite en el primario
+        
+        with TransactionService.read_only_transaction() as session:
+            yield from operation(session)
+    
     @staticmethod
     def rollback_on_error(operation: Callable) -> Any:
         """
@@ -114,6 +293,7 @@ class TransactionService:
         except Exception as e:
             # Hacer rollback de cualquier cambio pendiente
             db.session.rollback()
+            count_transaction('rollback')
             logger.error(f"❌ Operación falló, rollback ejecutado: {str(e)}")
             raise
 
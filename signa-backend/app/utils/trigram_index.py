@@ -0,0 +1,96 @@
+"""
+Índice invertido de trigramas en memoria
+
+Alternativa a pg_trgm para SQLite/desarrollo. Los trigramas y la similitud siguen
+la definición de pg_trgm: cada palabra en minúsculas se rellena con dos espacios
+al inicio y uno al final, y similitud = trigramas compartidos / trigramas totales.
+"""
+
+import heapq
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+_WORD_RE = re.compile(r'[^\W_]+', re.UNICODE)
+
+def trigrams(text: str) -> Set[str]:
+    """Obtiene el conjunto de trigramas de un texto (como show_trgm de pg_trgm)"""
+    result = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f'  {word} '
+        for i in range(len(padded) - 2):
+            result.add(padded[i:i + 3])
+    return result
+
+class TrigramIndex:
+    """Índice invertido trigrama -> IDs, con búsqueda top-N por similitud"""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._trigrams: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.built_at: Optional[float] = None
+
+    def build(self, items: List[Tuple[int, str]]) -> None:
+        """Reconstruye el índice completo a partir de pares (id, nombre)"""
+        postings: Dict[str, Set[int]] = defaultdict(set)
+        by_id: Dict[int, Set[str]] = {}
+        for item_id, name in items:
+            grams = trigrams(name)
+            by_id[item_id] = grams
+            for gram in grams:
+                postings[gram].add(item_id)
+
+        with self._lock:
+            self._postings = postings
+            self._trigrams = by_id
+            self.built_at = time.monotonic()
+
+    def add(self, item_id: int, name: str) -> None:
+        """Agrega o reemplaza un elemento"""
+        with self._lock:
+            self._remove(item_id)
+            grams = trigrams(name)
+            self._trigrams[item_id] = grams
+            for gram in grams:
+                self._postings[gram].add(item_id)
+
+    def remove(self, item_id: int) -> None:
+        """Elimina un elemento si existe"""
+        with self._lock:
+            self._remove(item_id)
+
+    def search(self, text: str, limit: int, threshold: float) -> List[Tuple[int, float]]:
+        """Retorna hasta 'limit' pares (id, similitud) con similitud >= threshold, de mayor a menor"""
+        query = trigrams(text)
+        if not query:
+            return []
+
+        with self._lock:
+            shared = Counter()
+            for gram in query:
+                shared.update(self._postings.get(gram, ()))
+
+            scored = []
+            for item_id, count in shared.items():
+                score = count / (len(query) + len(self._trigrams[item_id]) - count)
+                if score >= threshold:
+                    scored.append((score, -item_id))
+
+        return [(-neg_id, round(score, 4)) for score, neg_id in heapq.nlargest(limit, scored)]
+
+    def _remove(self, item_id: int) -> None:
+        for gram in self._trigrams.pop(item_id, ()):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del self._postings[gram]
+
+_sign_name_index = TrigramIndex()
+
+def get_sign_name_index() -> TrigramIndex:
+    """Obtiene el índice de trigramas de nombres de signos del proceso"""
+    return _sign_name_index
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: costo de require_auth en GET /api/sign/<id> con y sin caché de tokens verificados
+Uso: python -m benchmarks.bench_auth_cache [--requests 5000]
+
+Mide también la verificación aislada (JWTService.verify_token vs verify_token_cached)
+para separar el costo de autenticación del resto de la petición.
+"""
+
+import argparse
+import json
+from .common import create_bench_app, auth_headers, Timer
+from config import Config
+from app.domain.entities import User, Sign
+from app.infrastructure.repositories import SQLAlchemyUserRepository, SQLAlchemySignRepository
+from app.utils.jwt_service import JWTService
+
+def seed_sign(app) -> int:
+    with app.app_context():
+        user = SQLAlchemyUserRepository().create(User(None, 'Auth', 'Bench', 'auth-bench@bench.com', 'Calle 1'))
+        return SQLAlchemySignRepository().create(Sign(None, 'auth-bench-marca', user.id)).id
+
+def run_requests(client, path, headers, count) -> float:
+    with Timer() as timer:
+        for _ in range(count):
+            response = client.get(path, headers=headers)
+            assert response.status_code == 200, response.get_json()
+    return timer.elapsed
+
+def run_verify(fn, token, count) -> float:
+    with Timer() as timer:
+        for _ in range(count):
+            assert fn(token)
+    return timer.elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    app = create_bench_app()
+    client = app.test_client()
+    headers = auth_headers()
+    token = headers['Authorization'].split()[1]
+    path = f'/api/sign/{seed_sign(app)}'
+
+    Config.JWT_CACHE_ENABLED = False
+    uncached = run_requests(client, path, headers, args.requests)
+    Config.JWT_CACHE_ENABLED = True
+    cached = run_requests(client, path, headers, args.requests)
+
+    verify_uncached = run_verify(JWTService.verify_token, token, args.requests)
+    verify_cached = run_verify(JWTService.verify_token_cached, token, args.requests)
+
+    print(json.dumps({
+        'requests': args.requests,
+        'endpoint': 'GET /api/sign/<id>',
+        'uncached_req_per_second': round(args.requests / uncached, 1),
+        'cached_req_per_second': round(args.requests / cached, 1),
+        'verify_uncached_us': round(verify_uncached / args.requests * 1e6, 2),
+        'verify_cached_us': round(verify_cached / args.requests * 1e6, 2),
+        'cache': JWTService.cache_stats()
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark: creación de marcas una por una (POST /api/sign/create) vs en lote (POST /api/sign/bulk)
+Uso: python -m benchmarks.bench_bulk_create [--signs 1000] [--users 10]
+
+--users controla cuántos emails distintos hay en el lote (cada usuario nuevo
+implica un hash de contraseña, igual en ambos caminos). Por defecto es el máximo
+de usuarios nuevos por lote (SIGN_BULK_MAX_NEW_USERS); con más, /bulk responde 413.
+"""
+
+import argparse
+import json
+from .common import create_bench_app, auth_headers, Timer
+from config import Config
+
+def build_items(prefix: str, signs: int, users: int):
+    return [
+        {
+            'sign_name': f'{prefix}-marca-{i}',
+            'name': 'Cliente',
+            'surname': 'Bench',
+            'email': f'{prefix}-cliente-{i % users}@bench.com',
+            'address': 'Calle 1'
+        }
+        for i in range(signs)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--signs', type=int, default=1000)
+    parser.add_argument('--users', type=int, default=Config.SIGN_BULK_MAX_NEW_USERS)
+    args = parser.parse_args()
+
+    app = create_bench_app()
+    client = app.test_client()
+    headers = auth_headers()
+
+    with Timer() as single:
+        for item in build_items('single', args.signs, args.users):
+            response = client.post('/api/sign/create', json=item, headers=headers)
+            assert response.status_code == 201, response.get_json()
+
+    with Timer() as bulk:
+        response = client.post('/api/sign/bulk', json=build_items('bulk', args.signs, args.users), headers=headers)
+        assert response.status_code == 201, response.get_json()
+        assert response.get_json()['created'] == args.signs
+
+    print(json.dumps({
+        'signs': args.signs,
+        'users': args.users,
+        'per_item_seconds': round(single.elapsed, 3),
+        'bulk_seconds': round(bulk.elapsed, 3),
+        'per_item_signs_per_second': round(args.signs / single.elapsed, 1),
+        'bulk_signs_per_second': round(args.signs / bulk.elapsed, 1),
+        'speedup': round(single.elapsed / bulk.elapsed, 1)
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: listado de marcas con usuario, hidratando objetos ORM vs filas planas de columnas,
+y serialización con el json estándar de Flask vs orjson
+Uso: python -m benchmarks.bench_list_projection [--rows 20000] [--repeat 5]
+
+"Antes" es la forma previa de get_all_active_with_users (query(SignModel, UserModel) y copia
+a diccionarios) con el proveedor JSON estándar; "después" es el repositorio actual con
+FastJSONProvider (si orjson no está instalado, la serialización se mide solo con el estándar).
+"""
+
+import argparse
+import json
+from flask.json.provider import DefaultJSONProvider
+from .common import create_bench_app, Timer
+from app.infrastructure.database.models import db, User as UserModel, Sign as SignModel
+from app.infrastructure.repositories import SQLAlchemySignRepository
+from app.utils.json_provider import FastJSONProvider, fast_json_available
+from app.utils.transaction_service import TransactionService
+
+def seed(app, rows: int) -> None:
+    """Inserta usuarios y marcas con INSERT en lote (executemany), sin pasar por los servicios"""
+    users = max(1, rows // 10)
+    with app.app_context():
+        db.session.execute(db.insert(UserModel), [
+            {'name': 'Cliente', 'surname': 'Bench', 'email': f'list-{i}@bench.com', 'address': 'Calle 1', 'status': True}
+            for i in range(users)
+        ])
+        first_user_id = db.session.query(db.func.min(UserModel.id)).scalar()
+        db.session.execute(db.insert(SignModel), [
+            {'sign_name': f'list-marca-{i}', 'userId': first_user_id + i % users, 'status': True}
+            for i in range(rows)
+        ])
+        db.session.commit()
+
+def legacy_get_all_active_with_users():
+    """Forma previa: hidrata SignModel/UserModel y copia cada par a diccionarios"""
+
+    def transaction(session):
+        rows = session.query(SignModel, UserModel).join(
+            UserModel, SignModel.userId == UserModel.id
+        ).filter(SignModel.status == True, UserModel.status == True).all()
+        return [
+            {
+                'sign': {'id': s.id, 'sign_name': s.sign_name, 'status': s.status},
+                'user': {'id': u.id, 'name': u.name, 'surname': u.surname, 'email': u.email,
+                         'address': u.address, 'status': u.status}
+            }
+            for s, u in rows
+        ]
+
+    return TransactionService.execute_read_only(transaction)
+
+def best_of(repeat: int, fn):
+    best = None
+    for _ in range(repeat):
+        with Timer() as timer:
+            result = fn()
+        best = timer.elapsed if best is None else min(best, timer.elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_bench_app()
+    seed(app, args.rows)
+    repository = SQLAlchemySignRepository()
+    stdlib_json = DefaultJSONProvider(app)
+    fast_json = FastJSONProvider(app) if fast_json_available() else stdlib_json
+
+    with app.app_context():
+        legacy_fetch, legacy_rows = best_of(args.repeat, legacy_get_all_active_with_users)
+        projection_fetch, rows = best_of(args.repeat, repository.get_all_active_with_users)
+        assert rows == legacy_rows
+
+        body = {'signs': rows}
+        stdlib_dump, _ = best_of(args.repeat, lambda: stdlib_json.dumps(body))
+        fast_dump, _ = best_of(args.repeat, lambda: fast_json.dumps(body))
+
+    count = len(rows)
+    before = legacy_fetch + stdlib_dump
+    after = projection_fetch + fast_dump
+    print(json.dumps({
+        'rows': count,
+        'orjson': fast_json_available(),
+        'fetch_rows_per_second': {
+            'orm_hydration': round(count / legacy_fetch),
+            'column_projection': round(count / projection_fetch)
+        },
+        'serialize_rows_per_second': {
+            'stdlib_json': round(count / stdlib_dump),
+            'fast_json': round(count / fast_dump)
+        },
+        'total_rows_per_second': {
+            'before': round(count / before),
+            'after': round(count / after)
+        },
+        'speedup': round(before / after, 1)
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
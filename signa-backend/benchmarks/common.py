@@ -0,0 +1,43 @@
+"""
+Utilidades compartidas por los benchmarks del backend.
+
+Por defecto los benchmarks usan una base SQLite temporal para poder ejecutarse
+sin servicios externos. Para medir contra PostgreSQL exporte DATABASE_URL antes
+de ejecutarlos (la base debe ser desechable: los benchmarks crean datos).
+Este módulo debe importarse antes que config/app, ya que Config lee DATABASE_URL al importarse.
+"""
+
+import os
+import tempfile
+import time
+
+if 'DATABASE_URL' not in os.environ:
+    _db_dir = tempfile.mkdtemp(prefix='signa-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+from app.main import create_app
+from app.infrastructure.database.models import db
+from app.utils.jwt_service import JWTService
+
+def create_bench_app():
+    """Crea la aplicación Flask con el esquema creado"""
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+def auth_headers():
+    """Genera un header Authorization con un token válido (sin pasar por /login)"""
+    token = JWTService.create_access_token({'user_id': 1, 'username': 'bench@signa.com'})
+    return {'Authorization': f'Bearer {token}'}
+
+class Timer:
+    """Context manager que mide el tiempo transcurrido en segundos"""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        return False
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga HTTP de los endpoints principales con concurrencia fija
+Uso: python -m benchmarks.load_test [--users 1000] [--signs 10000] [--requests 2000] [--concurrency 16]
+     [--endpoints login,create,list,detail,patch,delete] [--base-url http://127.0.0.1:5000]
+     [--output resultado.json] [--baseline anterior.json --max-regression 0.2]
+
+Siembra la base de DATABASE_URL (SQLite temporal por defecto) con N usuarios y M marcas
+mediante INSERT en lote, y luego ejecuta cada endpoint con 'concurrency' hilos. Reporta
+en JSON req/s, p50/p95/p99, códigos de estado y consultas SQL por petición.
+
+- Sin --base-url las peticiones van al cliente de pruebas de Flask en este proceso, y las
+  consultas se cuentan con los eventos del engine.
+- Con --base-url se mide un servidor real (p. ej. Gunicorn con gunicorn.conf.py) que use
+  la misma DATABASE_URL; las consultas por petición se leen del header X-Query-Count
+  (solo si el servidor corre con SERVER_TIMING_ENABLED).
+- Con --baseline sale con código 1 si algún endpoint pierde más de --max-regression
+  (fracción) de req/s o empeora su p99 en esa proporción.
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .common import create_bench_app
+from app.infrastructure.database.models import db, User as UserModel, UserCredentials as UserCredentialsModel, Sign as SignModel
+from app.utils.cursor_service import CursorService
+from app.utils.password_service import PasswordService
+from app.utils.phonetic import spanish_phonetic_key
+
+ENDPOINTS = ('login', 'create', 'list', 'detail', 'patch', 'delete')
+LOAD_TEST_PASSWORD = 'load-test-password'
+LIST_PAGE_SIZE = 50
+
+def seed(app, users: int, signs: int, prefix: str):
+    """
+    Inserta usuarios (con credenciales) y marcas con INSERT en lote (executemany).
+    Todas las credenciales comparten un solo hash: sembrar no paga un bcrypt por usuario.
+    Returns: (emails de los usuarios, IDs de las marcas)
+    """
+    hashed_password = PasswordService.hash_password(LOAD_TEST_PASSWORD)
+    with app.app_context():
+        emails = [f'{prefix}-{i}@load.test' for i in range(users)]
+        db.session.execute(db.insert(UserModel), [
+            {'name': 'Cliente', 'surname': 'Carga', 'email': email, 'address': 'Calle 1', 'status': True}
+            for email in emails
+        ])
+        user_ids = [
+            user_id for user_id, in db.session.query(UserModel.id).filter(UserModel.email.in_(emails)).order_by(UserModel.id)
+        ]
+        db.session.execute(db.insert(UserCredentialsModel), [
+            {'id': user_id, 'username': email, 'password': hashed_password, 'status': True}
+            for user_id, email in zip(user_ids, emails)
+        ])
+
+        names = [f'{prefix}-marca-{i}' for i in range(signs)]
+        db.session.execute(db.insert(SignModel), [
+            {'sign_name': name, 'sign_name_phonetic': spanish_phonetic_key(name),
+             'userId': user_ids[i % len(user_ids)], 'status': True, 'version': 1}
+            for i, name in enumerate(names)
+        ])
+        sign_ids = [
+            sign_id for sign_id, in db.session.query(SignModel.id).filter(SignModel.sign_name.like(f'{prefix}-marca-%'))
+        ]
+        db.session.commit()
+    return emails, sign_ids
+
+class QueryCounter:
+    """Cuenta las consultas SQL ejecutadas por el hilo actual (modo en proceso)"""
+
+    def __init__(self):
+        self._local = threading.local()
+        event.listen(Engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        self._local.count = getattr(self._local, 'count', 0) + 1
+
+    def reset(self) -> None:
+        self._local.count = 0
+
+    @property
+    def count(self) -> int:
+        return getattr(self._local, 'count', 0)
+
+class InProcessClient:
+    """Cliente de pruebas de Flask (uno por hilo) con conteo de consultas"""
+
+    def __init__(self, app):
+        self.app = app
+        self.queries = QueryCounter()
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, body=None, headers=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        self.queries.reset()
+        response = client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.get_json(silent=True), self.queries.count
+
+class HTTPClient:
+    """Cliente HTTP contra un servidor real (consultas desde X-Query-Count, si el servidor lo envía)"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method: str, path: str, body=None, headers=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method, headers={
+            'Content-Type': 'application/json', **(headers or {})
+        })
+        try:
+            with urllib.request.urlopen(request) as response:
+                status, payload, response_headers = response.status, response.read(), response.headers
+        except urllib.error.HTTPError as e:
+            status, payload, response_headers = e.code, e.read(), e.headers
+        try:
+            parsed = json.loads(payload) if payload else None
+        except ValueError:
+            parsed = None
+        query_count = response_headers.get('X-Query-Count')
+        return status, parsed, int(query_count) if query_count is not None else None
+
+def build_scenarios(emails, sign_ids, prefix: str):
+    """Por endpoint: función (i) -> (método, ruta, cuerpo). 'delete' usa cada ID una sola vez"""
+    rng = random.Random(42)
+    deletable = list(sign_ids)
+    rng.shuffle(deletable)
+
+    return {
+        'login': lambda i: ('POST', '/api/auth/login', {'username': rng.choice(emails), 'password': LOAD_TEST_PASSWORD}),
+        # Usuarios existentes: mide la escritura de la marca, no el bcrypt de un usuario nuevo
+        'create': lambda i: ('POST', '/api/sign/create', {
+            'sign_name': f'{prefix}-nueva-{i}', 'name': 'Cliente', 'surname': 'Carga',
+            'email': rng.choice(emails), 'address': 'Calle 1'
+        }),
+        'list': lambda i: ('GET', f'/api/sign/list?limit={LIST_PAGE_SIZE}&after={CursorService.encode(rng.choice(sign_ids))}', None),
+        'detail': lambda i: ('GET', f'/api/sign/{rng.choice(sign_ids)}', None),
+        'patch': lambda i: ('PATCH', f'/api/sign/{rng.choice(sign_ids)}', {'sign_name': f'{prefix}-editada-{i}'}),
+        'delete': lambda i: ('DELETE', f'/api/sign/{deletable[i % len(deletable)]}', None)
+    }
+
+def percentile(sorted_values, fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+def run_endpoint(client, scenario, requests: int, concurrency: int, headers) -> dict:
+    """Ejecuta 'requests' peticiones con 'concurrency' hilos y resume latencias, códigos y consultas"""
+    counter = itertools.count()
+    lock = threading.Lock()
+
+    def one(_):
+        with lock:
+            method, path, body = scenario(next(counter))
+        started_at = time.perf_counter()
+        status, _, queries = client.request(method, path, body, headers)
+        return time.perf_counter() - started_at, status, queries
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, range(requests)))
+    elapsed = time.perf_counter() - started_at
+
+    latencies = sorted(result[0] for result in results)
+    status_codes = {}
+    for _, status, _ in results:
+        status_codes[str(status)] = status_codes.get(str(status), 0) + 1
+    queries = [result[2] for result in results if result[2] is not None]
+
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'requests_per_second': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'status_codes': status_codes,
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None
+    }
+
+def compare(results: dict, baseline: dict, max_regression: float):
+    """Regresiones respecto de una ejecución anterior (mismo formato de salida)"""
+    failures = []
+    for endpoint, current in results['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(endpoint)
+        if not previous:
+            continue
+        if current['requests_per_second'] < previous['requests_per_second'] * (1 - max_regression):
+            failures.append(f"{endpoint}: {current['requests_per_second']} req/s < {previous['requests_per_second']} req/s")
+        if current['p99_ms'] > previous['p99_ms'] * (1 + max_regression):
+            failures.append(f"{endpoint}: p99 {current['p99_ms']} ms > {previous['p99_ms']} ms")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--signs', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--login-requests', type=int, default=200, help='el login está acotado por bcrypt')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS))
+    parser.add_argument('--base-url')
+    parser.add_argument('--output')
+    parser.add_argument('--baseline')
+    parser.add_argument('--max-regression', type=float, default=0.2)
+    args = parser.parse_args()
+
+    endpoints = [endpoint.strip() for endpoint in args.endpoints.split(',') if endpoint.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"Endpoints desconocidos: {', '.join(sorted(unknown))}")
+
+    app = create_bench_app()
+    prefix = f'load{int(time.time())}'
+    seed_started = time.perf_counter()
+    emails, sign_ids = seed(app, args.users, args.signs, prefix)
+    seed_seconds = time.perf_counter() - seed_started
+
+    client = HTTPClient(args.base_url) if args.base_url else InProcessClient(app)
+
+    # Token de un usuario sembrado, obtenido por /login como cualquier cliente
+    status, body, _ = client.request('POST', '/api/auth/login', {'username': emails[0], 'password': LOAD_TEST_PASSWORD})
+    if status != 200:
+        sys.exit(f"❌ No se pudo iniciar sesión con el usuario sembrado (HTTP {status})")
+    headers = {'Authorization': f"Bearer {body['access_token']}"}
+
+    scenarios = build_scenarios(emails, sign_ids, prefix)
+    results = {
+        'target': args.base_url or 'in-process',
+        'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+        'users': args.users,
+        'signs': args.signs,
+        'seed_seconds': round(seed_seconds, 2),
+        'endpoints': {}
+    }
+
+    # 'delete' al final: el resto de los escenarios usa las marcas sembradas
+    for endpoint in sorted(endpoints, key=ENDPOINTS.index):
+        requests = min(args.requests, args.login_requests) if endpoint == 'login' else args.requests
+        if endpoint == 'delete':
+            requests = min(requests, len(sign_ids))
+        results['endpoints'][endpoint] = run_endpoint(client, scenarios[endpoint], requests, args.concurrency, headers)
+
+    failures = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(results, json.load(f), args.max_regression)
+        results['regressions'] = failures
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Presupuesto de arranque: tiempo de importación y tiempo hasta la primera petición
+Uso: python -m benchmarks.startup_budget [--max-import-ms 1000] [--max-first-request-ms 1500]
+
+Cada medición corre en un proceso nuevo (como un worker de Gunicorn) con DATABASE_URL
+apuntando a una base inaccesible: arrancar y responder la primera petición que no
+necesita datos no debe abrir conexiones. Sale con código 1 si se supera el presupuesto,
+para poder usarlo como verificación en CI.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Base inaccesible: cualquier intento de conexión durante el arranque falla
+UNREACHABLE_DATABASE_URL = 'sqlite:////nonexistent-signa-startup-check/signa.db'
+
+FIRST_REQUEST_SCRIPT = '''
+import json, time
+start = time.perf_counter()
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+connections = []
+event.listen(Engine, 'connect', lambda *args: connections.append(1))
+from app.main import create_app
+app = create_app()
+response = app.test_client().get('/api/sign/list')
+print(json.dumps({
+    'first_request_ms': (time.perf_counter() - start) * 1000,
+    'status_code': response.status_code,
+    'db_connections': len(connections)
+}))
+'''
+
+def run_python(args):
+    env = dict(os.environ, DATABASE_URL=UNREACHABLE_DATABASE_URL)
+    return subprocess.run(
+        [sys.executable, *args], cwd=PROJECT_DIR, env=env,
+        capture_output=True, text=True, check=True
+    )
+
+def measure_import_ms() -> float:
+    """Tiempo acumulado de 'import app.main' según python -X importtime"""
+    result = run_python(['-X', 'importtime', '-c', 'import app.main'])
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| app\.main$', line)
+        if match:
+            return int(match.group(1)) / 1000
+    raise RuntimeError('No se encontró app.main en la salida de -X importtime')
+
+def measure_first_request() -> dict:
+    """Tiempo desde el inicio del proceso (sin el intérprete) hasta responder la primera petición"""
+    return json.loads(run_python(['-c', FIRST_REQUEST_SCRIPT]).stdout)
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--max-import-ms', type=float, default=1000)
+    parser.add_argument('--max-first-request-ms', type=float, default=1500)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    import_ms = median([measure_import_ms() for _ in range(args.runs)])
+    first_requests = [measure_first_request() for _ in range(args.runs)]
+    first_request_ms = median([run['first_request_ms'] for run in first_requests])
+    db_connections = max(run['db_connections'] for run in first_requests)
+
+    failures = []
+    if import_ms > args.max_import_ms:
+        failures.append(f'import app.main: {import_ms:.0f} ms > {args.max_import_ms:.0f} ms')
+    if first_request_ms > args.max_first_request_ms:
+        failures.append(f'primera petición: {first_request_ms:.0f} ms > {args.max_first_request_ms:.0f} ms')
+    if db_connections:
+        failures.append(f'el arranque abrió {db_connections} conexiones a la base de datos')
+    if any(run['status_code'] != 401 for run in first_requests):
+        failures.append('la primera petición no respondió 401 (se esperaba sin token)')
+
+    print(json.dumps({
+        'runs': args.runs,
+        'import_ms': round(import_ms, 1),
+        'first_request_ms': round(first_request_ms, 1),
+        'db_connections': db_connections,
+        'budget': {'import_ms': args.max_import_ms, 'first_request_ms': args.max_first_request_ms},
+        'failures': failures
+    }, indent=2, ensure_ascii=False))
+
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
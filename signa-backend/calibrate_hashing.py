@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Script para calibrar el costo del hash de contraseñas en el host actual
+Uso: python calibrate_hashing.py [--target-ms 250] [--algorithm bcrypt|argon2id|all]
+
+Mide bcrypt y/o argon2id en esta máquina y sugiere los parámetros más costosos
+que no superan la latencia objetivo por login. Las variables sugeridas se copian
+al .env; los hashes existentes se regeneran solos en el siguiente login exitoso.
+"""
+
+import argparse
+from config import Config
+from app.utils.password_hashers import calibrate_bcrypt, calibrate_argon2id
+
+def main():
+    parser = argparse.ArgumentParser(description='Calibra el costo del hash de contraseñas')
+    parser.add_argument('--target-ms', type=float, default=250.0, help='Latencia objetivo por hash (ms)')
+    parser.add_argument('--algorithm', choices=['bcrypt', 'argon2id', 'all'], default='all')
+    parser.add_argument('--argon2-memory-cost', type=int, default=Config.ARGON2_MEMORY_COST, help='Memoria argon2id (KiB)')
+    parser.add_argument('--argon2-parallelism', type=int, default=Config.ARGON2_PARALLELISM)
+    args = parser.parse_args()
+
+    print(f"⏱️  Calibrando hash de contraseñas (objetivo: {args.target_ms:.0f} ms por hash)...")
+    suggestions = []
+
+    if args.algorithm in ('bcrypt', 'all'):
+        rounds, elapsed = calibrate_bcrypt(args.target_ms)
+        print(f"🔒 bcrypt: {rounds} rounds -> {elapsed:.1f} ms")
+        suggestions.append(f"BCRYPT_LOG_ROUNDS={rounds}")
+
+    if args.algorithm in ('argon2id', 'all'):
+        time_cost, elapsed = calibrate_argon2id(args.target_ms, args.argon2_memory_cost, args.argon2_parallelism)
+        print(f"🔒 argon2id: time_cost={time_cost}, memory_cost={args.argon2_memory_cost} KiB, "
+              f"parallelism={args.argon2_parallelism} -> {elapsed:.1f} ms")
+        suggestions.extend([
+            f"ARGON2_TIME_COST={time_cost}",
+            f"ARGON2_MEMORY_COST={args.argon2_memory_cost}",
+            f"ARGON2_PARALLELISM={args.argon2_parallelism}",
+        ])
+
+    print("-" * 50)
+    print("📋 Variables sugeridas para el .env:")
+    for line in suggestions:
+        print(f"   {line}")
+
+if __name__ == '__main__':
+    main()
@@ -22,8 +22,98 @@ class Config:
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRE_MINUTES', 30))
     
+    # Caché de tokens ya verificados en require_auth (las entradas nunca superan el 'exp' del token)
+    JWT_CACHE_ENABLED = os.getenv('JWT_CACHE_ENABLED', 'True').lower() == 'true'
+    JWT_CACHE_MAX_ENTRIES = int(os.getenv('JWT_CACHE_MAX_ENTRIES', 10000))
+    JWT_CACHE_TTL_SECONDS = int(os.getenv('JWT_CACHE_TTL_SECONDS', 300))
+    
+    # Revocación de tokens (logout): filtro en memoria sincronizado desde la tabla revoked_tokens
+    REVOCATION_SYNC_INTERVAL_SECONDS = float(os.getenv('REVOCATION_SYNC_INTERVAL_SECONDS', 5))
+    # Carga completa periódica: recupera revocaciones con commit tardío y purga las expiradas
+    REVOCATION_FULL_SYNC_INTERVAL_SECONDS = float(os.getenv('REVOCATION_FULL_SYNC_INTERVAL_SECONDS', 60))
+    REVOCATION_BLOOM_CAPACITY = int(os.getenv('REVOCATION_BLOOM_CAPACITY', 100000))
+    REVOCATION_BLOOM_ERROR_RATE = float(os.getenv('REVOCATION_BLOOM_ERROR_RATE', 0.001))
+    
     # Configuración de seguridad
+    # Algoritmo para hashes nuevos: 'bcrypt' o 'argon2id' (ambos se verifican siempre)
+    PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'bcrypt')
     BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 3))
+    ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 65536))  # KiB
+    ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', 4))
+    
+    # Pool acotado de hashing: hilos de cálculo y cuántas operaciones pueden esperar antes de responder 503
+    HASH_POOL_WORKERS = int(os.getenv('HASH_POOL_WORKERS', os.cpu_count() or 1))
+    HASH_POOL_MAX_QUEUE = int(os.getenv('HASH_POOL_MAX_QUEUE', 16))
+    
+    # Configuración de paginación del listado de marcas
+    SIGN_LIST_DEFAULT_LIMIT = int(os.getenv('SIGN_LIST_DEFAULT_LIMIT', 50))
+    SIGN_LIST_MAX_LIMIT = int(os.getenv('SIGN_LIST_MAX_LIMIT', 500))
+    # Vigencia máxima del ETag del listado en segundos (0 = sin límite, solo el contador de versiones)
+    SIGN_LIST_ETAG_MAX_AGE_SECONDS = int(os.getenv('SIGN_LIST_ETAG_MAX_AGE_SECONDS', 60))
+    
+    # Máximo de marcas por petición en /api/sign/bulk
+    SIGN_BULK_MAX_ITEMS = int(os.getenv('SIGN_BULK_MAX_ITEMS', 5000))
+    # Máximo de usuarios nuevos por lote: cada uno cuesta un hash de contraseña (~250 ms) en la petición
+    SIGN_BULK_MAX_NEW_USERS = int(os.getenv('SIGN_BULK_MAX_NEW_USERS', 10))
+    
+    # Filas por lote del cursor del servidor en /api/sign/export
+    SIGN_EXPORT_BATCH_SIZE = int(os.getenv('SIGN_EXPORT_BATCH_SIZE', 1000))
+    
+    # Búsqueda de marcas similares por trigramas (/api/sign/similar)
+    SIGN_SIMILARITY_THRESHOLD = float(os.getenv('SIGN_SIMILARITY_THRESHOLD', 0.3))
+    SIGN_SIMILAR_DEFAULT_LIMIT = int(os.getenv('SIGN_SIMILAR_DEFAULT_LIMIT', 10))
+    SIGN_SIMILAR_MAX_LIMIT = int(os.getenv('SIGN_SIMILAR_MAX_LIMIT', 50))
+    # Segundos antes de reconstruir el índice en memoria (solo sin PostgreSQL)
+    SIGN_SIMILARITY_INDEX_TTL_SECONDS = float(os.getenv('SIGN_SIMILARITY_INDEX_TTL_SECONDS', 60))
+    
+    # Pool de conexiones por worker (SQLALCHEMY_ENGINE_OPTIONS se arma en create_app)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT_SECONDS = float(os.getenv('DB_POOL_TIMEOUT_SECONDS', 30))
+    # Reciclar conexiones antes de que el servidor o un proxy las cierre por inactividad
+    DB_POOL_RECYCLE_SECONDS = int(os.getenv('DB_POOL_RECYCLE_SECONDS', 1800))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    # statement_timeout de cada conexión en PostgreSQL (0 = sin límite)
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))
+    
+    # Réplica de lectura opcional para los listados y lecturas de marcas (vacío = sin réplica)
+    DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL', '')
+    # Tras escribir, el usuario lee del primario durante estos segundos (en el mismo worker)
+    DB_READ_YOUR_WRITES_SECONDS = float(os.getenv('DB_READ_YOUR_WRITES_SECONDS', 5))
+    # Si la réplica falla, segundos leyendo del primario antes de volver a intentarla
+    DB_REPLICA_RETRY_SECONDS = float(os.getenv('DB_REPLICA_RETRY_SECONDS', 30))
+    
+    # Conexiones del pool que cada worker abre al arrancar (0 = sin precalentamiento)
+    DB_POOL_WARMUP_CONNECTIONS = int(os.getenv('DB_POOL_WARMUP_CONNECTIONS', 0))
+    
+    # Caché de lecturas por ID de marcas (por proceso: en otros workers un cambio se ve al vencer el TTL)
+    SIGN_CACHE_ENABLED = os.getenv('SIGN_CACHE_ENABLED', 'False').lower() == 'true'
+    SIGN_CACHE_MAX_ENTRIES = int(os.getenv('SIGN_CACHE_MAX_ENTRIES', 10000))
+    SIGN_CACHE_TTL_SECONDS = float(os.getenv('SIGN_CACHE_TTL_SECONDS', 30))
+    
+    # Serializar JSON con orjson cuando está instalado (si no, el json estándar de Flask)
+    FAST_JSON_ENABLED = os.getenv('FAST_JSON_ENABLED', 'True').lower() == 'true'
+    
+    # Headers Server-Timing y X-Query-Count por petición (desactivado no agrega costo)
+    SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'False').lower() == 'true'
+    # Peticiones más lentas que esto se registran como una línea JSON (solo con SERVER_TIMING_ENABLED)
+    SLOW_REQUEST_THRESHOLD_MS = float(os.getenv('SLOW_REQUEST_THRESHOLD_MS', 1000))
+    
+    # Métricas de Prometheus en GET /metrics (requiere prometheus_client)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+    
+    # Registro de consultas lentas con su plan de ejecución (ver slow_queries.py)
+    SLOW_QUERY_LOG_ENABLED = os.getenv('SLOW_QUERY_LOG_ENABLED', 'False').lower() == 'true'
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+    # Base del nombre: cada proceso escribe en <nombre>.<pid>.jsonl (slow_queries.py los combina)
+    SLOW_QUERY_LOG_FILE = os.getenv('SLOW_QUERY_LOG_FILE', 'logs/slow_queries.jsonl')
+    SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv('SLOW_QUERY_LOG_MAX_BYTES', 10 * 1024 * 1024))
+    SLOW_QUERY_LOG_BACKUP_COUNT = int(os.getenv('SLOW_QUERY_LOG_BACKUP_COUNT', 5))
+    # Fracción de las consultas lentas a las que se les captura el EXPLAIN (0 = nunca)
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.1))
+    # EXPLAIN ANALYZE vuelve a ejecutar la consulta (solo SELECT); pensado para staging
+    SLOW_QUERY_EXPLAIN_ANALYZE = os.getenv('SLOW_QUERY_EXPLAIN_ANALYZE', 'False').lower() == 'true'
     
     # Configuración de la aplicación
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
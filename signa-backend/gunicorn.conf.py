@@ -0,0 +1,101 @@
+"""
+Configuración de Gunicorn (se carga automáticamente desde el directorio de trabajo)
+Uso: gunicorn "app.main:create_app()"
+
+Dimensionamiento por defecto (cada valor se puede fijar con su variable GUNICORN_*):
+- workers = núcleos disponibles: el trabajo pesado de CPU (bcrypt/argon2) ya corre en
+  el pool de hashing de cada worker; más procesos que núcleos solo compiten por CPU.
+- threads = 4 por worker (gthread): solapan la espera de la base de datos de las
+  lecturas; el pool de conexiones se dimensiona igual para que ningún hilo espere un checkout.
+- HASH_POOL_WORKERS = núcleos / workers, para no tener más hilos de hashing que núcleos en total.
+
+Las métricas de Prometheus de todos los workers se suman en /metrics mediante archivos
+en PROMETHEUS_MULTIPROC_DIR (por defecto un directorio en /dev/shm o en el temporal).
+"""
+
+import glob
+import os
+import tempfile
+
+def _available_cpus() -> int:
+    """Núcleos utilizables por el proceso (afinidad y cuota de CPU del cgroup, si hay)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # Contenedores con límite de CPU (cgroup v2: "cuota periodo" o "max")
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cpus)
+
+CPUS = _available_cpus()
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5000')}")
+workers = int(os.getenv('GUNICORN_WORKERS', CPUS))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+# La aplicación se importa una vez en el master y los workers la heredan (create_app no abre conexiones)
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True').lower() == 'true'
+
+# Reciclar workers periódicamente (con jitter para que no se reinicien todos a la vez)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 5000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 500))
+
+# timeout: worker sin responder al master; graceful_timeout: tiempo para terminar peticiones en curso
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+# Heartbeat de los workers en memoria (evita bloqueos de disco en contenedores)
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+
+# Defaults de la aplicación según el dimensionamiento (una variable ya definida tiene prioridad).
+# Se fijan antes de cargar la aplicación: Config lee el entorno al importarse.
+os.environ.setdefault('HASH_POOL_WORKERS', str(max(1, CPUS // workers)))
+os.environ.setdefault('DB_POOL_SIZE', str(threads))
+
+# prometheus_client elige el modo multiproceso al importarse: la variable debe existir antes
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+if METRICS_ENABLED:
+    os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(
+        worker_tmp_dir or tempfile.gettempdir(), f"signa-metrics-{os.getenv('PORT', '5000')}"
+    ))
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+def on_starting(server):
+    """Descarta las métricas de una ejecución anterior (los contadores empiezan en cero)"""
+    if METRICS_ENABLED:
+        for path in glob.glob(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], '*.db')):
+            os.remove(path)
+
+def post_worker_init(worker):
+    """
+    Ya en el worker (tras el fork): descarta las conexiones heredadas del master y
+    precalienta el pool de conexiones (DB_POOL_WARMUP_CONNECTIONS)
+    """
+    from config import Config
+    from app.utils.db_warmup import dispose_inherited_connections, warm_up_connection_pool
+
+    dispose_inherited_connections(worker.wsgi)
+
+    opened = warm_up_connection_pool(worker.wsgi, Config.DB_POOL_WARMUP_CONNECTIONS)
+    if opened:
+        worker.log.info("🔥 Pool precalentado con %s conexiones", opened)
+
+def child_exit(server, worker):
+    """Un worker terminó (reciclado o caído): sus contadores se siguen sumando, sus gauges por proceso no"""
+    if METRICS_ENABLED:
+        try:
+            from prometheus_client import multiprocess
+        except ImportError:
+            return
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,10 +1,23 @@
 import os
 import sys
+import time
+import hashlib
+import inspect as pyinspect
+from contextlib import contextmanager
 from datetime import datetime
-from app.infrastructure.database.models import db
+from typing import Dict
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from app.infrastructure.database.models import db, SchemaMigration
 from app.domain.entities import User, UserCredentials
 from app.infrastructure.repositories import SQLAlchemyUserRepository, SQLAlchemyUserCredentialsRepository
 from app.utils.password_service import PasswordService
+from app.utils.phonetic import spanish_phonetic_key
+from app.utils.transaction_service import TransactionService
+from config import Config
+
+# Clave del advisory lock de PostgreSQL que serializa las migraciones entre despliegues
+MIGRATION_LOCK_KEY = 7_240_011
 
 class MigrationManager:
     """Gestor de migraciones para la base de datos"""
@@ -17,6 +30,11 @@ class MigrationManager:
     def _register_migrations(self):
         """Registra todas las migraciones disponibles"""
         self.migrations = [
+            {
+                'id': '000_create_schema',
+                'description': 'Crear las tablas de la base de datos',
+                'function': self._create_schema
+            },
             {
                 'id': '001_create_admin_user',
                 'description': 'Crear usuario administrador por defecto',
@@ -26,26 +44,125 @@ class MigrationManager:
                 'id': '002_update_database_structure',
                 'description': 'Actualizar estructura de BD con campos status y sign_name',
                 'function': self._update_database_structure
+            },
+            {
+                'id': '003_create_sign_name_trgm_index',
+                'description': 'Crear índice GIN de trigramas (pg_trgm) sobre signs.sign_name',
+                'function': self._create_sign_name_trgm_index
+            },
+            {
+                'id': '004_backfill_sign_name_phonetic',
+                'description': 'Agregar signs.sign_name_phonetic (indexada) y calcular las claves fonéticas existentes',
+                'function': self._backfill_sign_name_phonetic
+            },
+            {
+                'id': '005_case_insensitive_unique_indexes',
+                'description': 'Crear índices únicos sobre lower(sign_name) (marcas activas) y lower(email)',
+                'function': self._create_case_insensitive_unique_indexes
+            },
+            {
+                'id': '006_add_sign_versions',
+                'description': 'Agregar signs.version (indexada) y su secuencia en PostgreSQL (ETag de las lecturas de marcas)',
+                'function': self._add_sign_versions
             }
         ]
     
     def run_migrations(self):
-        """Ejecuta todas las migraciones pendientes"""
+        """Ejecuta solo las migraciones pendientes (las que no están en schema_migrations)"""
         print("🚀 Iniciando migraciones...")
         
+        # Camino rápido: una sola consulta al registro cuando no hay nada pendiente
+        applied = self._get_applied_migrations()
+        if not self._pending_migrations(applied):
+            self._warn_changed_migrations(applied)
+            print("✅ Base de datos al día, no hay migraciones pendientes")
+            return
+        
+        with self._migration_lock():
+            # Otro despliegue pudo aplicar migraciones mientras se esperaba el lock
+            applied = self._get_applied_migrations()
+            self._warn_changed_migrations(applied)
+            
+            for migration in self._pending_migrations(applied):
+                try:
+                    print(f"📋 Ejecutando migración: {migration['id']}")
+                    print(f"📝 Descripción: {migration['description']}")
+                    
+                    start = time.perf_counter()
+                    migration['function']()
+                    execution_ms = int((time.perf_counter() - start) * 1000)
+                    
+                    self._record_migration(migration, execution_ms)
+                    
+                    print(f"✅ Migración {migration['id']} completada exitosamente ({execution_ms} ms)")
+                    print("-" * 50)
+                    
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"❌ Error en migración {migration['id']}: {str(e)}")
+                    raise
+    
+    def _pending_migrations(self, applied: Dict[str, str]):
+        """Migraciones registradas que no figuran en el registro, en orden"""
+        return [migration for migration in self.migrations if migration['id'] not in applied]
+    
+    @staticmethod
+    def _checksum(migration) -> str:
+        """sha256 del id y el código fuente de la migración"""
+        source = pyinspect.getsource(migration['function'])
+        return hashlib.sha256(f"{migration['id']}\n{source}".encode('utf-8')).hexdigest()
+    
+    def _get_applied_migrations(self) -> Dict[str, str]:
+        """Obtiene {id: checksum} de las migraciones aplicadas; crea el registro si no existe"""
+        try:
+            rows = db.session.execute(text("SELECT id, checksum FROM schema_migrations")).all()
+            db.session.commit()
+            return {row.id: row.checksum for row in rows}
+        except SQLAlchemyError:
+            db.session.rollback()
+            SchemaMigration.__table__.create(db.engine, checkfirst=True)
+            print("📒 Registro schema_migrations creado")
+            return {}
+    
+    def _warn_changed_migrations(self, applied: Dict[str, str]):
+        """Avisa si el código de una migración ya aplicada cambió (no se vuelve a ejecutar)"""
         for migration in self.migrations:
+            checksum = applied.get(migration['id'])
+            if checksum and checksum != self._checksum(migration):
+                print(f"⚠️  La migración {migration['id']} cambió después de aplicarse (checksum distinto)")
+    
+    def _record_migration(self, migration, execution_ms: int):
+        """Registra la migración como aplicada"""
+        db.session.add(SchemaMigration(
+            id=migration['id'],
+            checksum=self._checksum(migration),
+            applied_at=datetime.utcnow(),
+            execution_ms=execution_ms
+        ))
+        db.session.commit()
+    
+    @contextmanager
+    def _migration_lock(self):
+        """
+        En PostgreSQL toma un advisory lock de sesión en una conexión dedicada,
+        para que solo un despliegue migre a la vez. En otros motores no bloquea.
+        """
+        if db.engine.dialect.name != 'postgresql':
+            yield
+            return
+        
+        with db.engine.connect() as connection:
+            print("🔒 Esperando el lock de migraciones...")
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {'key': MIGRATION_LOCK_KEY})
             try:
-                print(f"📋 Ejecutando migración: {migration['id']}")
-                print(f"📝 Descripción: {migration['description']}")
-                
-                migration['function']()
-                
-                print(f"✅ Migración {migration['id']} completada exitosamente")
-                print("-" * 50)
-                
-            except Exception as e:
-                print(f"❌ Error en migración {migration['id']}: {str(e)}")
-                raise
+                yield
+            finally:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': MIGRATION_LOCK_KEY})
+    
+    def _create_schema(self):
+        """Migración: Crear las tablas definidas en los modelos (antes se hacía al importar la app)"""
+        db.create_all()
+        print("✅ Tablas creadas")
     
     def _create_admin_user(self):
         """Migración: Crear usuario administrador por defecto"""
@@ -68,31 +185,33 @@ class MigrationManager:
             status=True
         )
         
-        # Guardar usuario en la base de datos
-        saved_user = user_repo.create(admin_user)
-        
         # Contraseña por defecto para admin
         plain_password = 'admin123'
         
         # Hashear la contraseña usando bcrypt
         hashed_password = self.password_service.hash_password(plain_password)
         
-        # Crear credenciales con el mismo ID del usuario
-        admin_credentials = UserCredentials(
-            id=saved_user.id,  # Mismo ID que el usuario
-            username="admin@signa.com",  # Username será igual al email
-            password=hashed_password,
-            status=True
-        )
-        
-        # Guardar credenciales
-        credentials_repo.create(admin_credentials)
+        # Usuario y credenciales en una sola transacción
+        with TransactionService.unit_of_work():
+            # Guardar usuario en la base de datos
+            saved_user = user_repo.create(admin_user)
+            
+            # Crear credenciales con el mismo ID del usuario
+            admin_credentials = UserCredentials(
+                id=saved_user.id,  # Mismo ID que el usuario
+                username="admin@signa.com",  # Username será igual al email
+                password=hashed_password,
+                status=True
+            )
+            
+            # Guardar credenciales
+            credentials_repo.create(admin_credentials)
         
         print(f"👤 Usuario admin creado con ID: {saved_user.id}")
         print(f"📧 Email: {saved_user.email}")
         print(f"👤 Username: {admin_credentials.username}")
         print(f"🔑 Contraseña: {plain_password}")
-        print(f"🔒 Contraseña hasheada con bcrypt (12 rounds, muy segura)")
+        print(f"🔒 Contraseña hasheada con {Config.PASSWORD_HASHER}")
         print("⚠️  IMPORTANTE: Cambia esta contraseña en producción")
     
     def _update_database_structure(self):
@@ -109,19 +228,111 @@ class MigrationManager:
         print("   - signs.status (boolean, default True)")
         print("   - signs.sign_name (string, nullable=False)")
 
+    def _create_sign_name_trgm_index(self):
+        """Migración: Crear índice GIN de trigramas para la búsqueda de marcas similares"""
+        if db.engine.dialect.name != 'postgresql':
+            print(f"ℹ️  Motor '{db.engine.dialect.name}' sin pg_trgm: se usará el índice de trigramas en memoria")
+            return
+        
+        db.session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        db.session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_signs_sign_name_trgm "
+            "ON signs USING gin (lower(sign_name) gin_trgm_ops) "
+            "WHERE status = true"
+        ))
+        db.session.commit()
+        
+        print("✅ Índice ix_signs_sign_name_trgm disponible")
+
+    def _backfill_sign_name_phonetic(self, batch_size: int = 1000):
+        """Migración: Agregar la columna de clave fonética y calcularla por lotes para las filas existentes"""
+        columns = {column['name'] for column in inspect(db.engine).get_columns('signs')}
+        if 'sign_name_phonetic' not in columns:
+            db.session.execute(text("ALTER TABLE signs ADD COLUMN sign_name_phonetic VARCHAR(200)"))
+        db.session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_signs_sign_name_phonetic ON signs (sign_name_phonetic)"
+        ))
+        db.session.commit()
+        
+        # Lotes por keyset sobre id: cada lote es una transacción corta
+        total = 0
+        last_id = 0
+        while True:
+            rows = db.session.execute(
+                text(
+                    "SELECT id, sign_name FROM signs "
+                    "WHERE sign_name_phonetic IS NULL AND id > :last_id "
+                    "ORDER BY id LIMIT :batch_size"
+                ),
+                {'last_id': last_id, 'batch_size': batch_size}
+            ).all()
+            if not rows:
+                break
+            
+            db.session.execute(
+                text("UPDATE signs SET sign_name_phonetic = :phonetic WHERE id = :id"),
+                [{'id': row.id, 'phonetic': spanish_phonetic_key(row.sign_name)} for row in rows]
+            )
+            db.session.commit()
+            
+            total += len(rows)
+            last_id = rows[-1].id
+        
+        print(f"✅ Claves fonéticas calculadas: {total}")
+
+    def _create_case_insensitive_unique_indexes(self):
+        """Migración: Unicidad sin distinguir mayúsculas garantizada por la base de datos"""
+        checks = [
+            ('signs', "SELECT lower(sign_name) AS value FROM signs WHERE status = true "
+                      "GROUP BY lower(sign_name) HAVING count(*) > 1"),
+            ('users', "SELECT lower(email) AS value FROM users "
+                      "GROUP BY lower(email) HAVING count(*) > 1")
+        ]
+        for table, query in checks:
+            duplicates = [row.value for row in db.session.execute(text(query + " LIMIT 10")).all()]
+            if duplicates:
+                raise Exception(f"Valores duplicados en {table} (resolver antes de migrar): {duplicates}")
+        
+        db.session.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_signs_sign_name_lower_active "
+            "ON signs (lower(sign_name)) WHERE status = true"
+        ))
+        db.session.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_users_email_lower ON users (lower(email))"
+        ))
+        db.session.commit()
+        
+        print("✅ Índices uq_signs_sign_name_lower_active y uq_users_email_lower disponibles")
+
+    def _add_sign_versions(self):
+        """
+        Migración: Versión por marca para ETag / If-None-Match. Las versiones salen de una
+        fuente global (secuencia en PostgreSQL) y el índice sirve max(version) al listado.
+        """
+        columns = {column['name'] for column in inspect(db.engine).get_columns('signs')}
+        if 'version' not in columns:
+            db.session.execute(text("ALTER TABLE signs ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+        db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_signs_version ON signs (version)"))
+        
+        if db.engine.dialect.name == 'postgresql':
+            db.session.execute(text("CREATE SEQUENCE IF NOT EXISTS signs_version_seq"))
+            db.session.execute(text(
+                "SELECT setval('signs_version_seq', GREATEST((SELECT COALESCE(max(version), 0) FROM signs), 1))"
+            ))
+        db.session.commit()
+        
+        print("✅ Columna signs.version, índice ix_signs_version y secuencia de versiones disponibles")
+
 def run_migrations():
     """Función principal para ejecutar migraciones"""
     try:
         from app.main import create_app
         
-        # Crear aplicación Flask
-        app = create_app()
+        # Crear aplicación Flask (sin réplica: el esquema se crea en el primario y se replica)
+        app = create_app(use_read_replica=False)
         
         with app.app_context():
-            # Crear tablas si no existen
-            db.create_all()
-            
-            # Ejecutar migraciones
+            # Ejecutar migraciones pendientes
             migration_manager = MigrationManager()
             migration_manager.run_migrations()
             
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Script para revisar el registro de consultas lentas (SLOW_QUERY_LOG_ENABLED)
+Uso: python slow_queries.py [--file logs/slow_queries.jsonl] [--since-minutes 60] [--origin get_all]
+     [--top 20] [--tail 10 [--plans]]
+
+Lee los archivos de todos los procesos (logs/slow_queries.<pid>.jsonl y sus rotaciones)
+ordenados por fecha. Sin --tail agrupa por método de origen y SQL, ordenado por tiempo total: las consultas
+que más tiempo suman aparecen primero. Con --tail muestra las últimas entradas con sus
+parámetros y, con --plans, el plan capturado (si la entrada fue muestreada para EXPLAIN).
+"""
+
+import argparse
+import datetime
+import json
+from config import Config
+from app.utils.slow_query_log import read_slow_query_log
+
+def parse_timestamp(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value.rstrip('Z'))
+
+def summarize(entries, top: int) -> None:
+    groups = {}
+    for entry in entries:
+        key = (entry.get('origin') or '?', entry['statement'])
+        group = groups.setdefault(key, {'durations': [], 'plans': 0})
+        group['durations'].append(entry['duration_ms'])
+        group['plans'] += 'plan' in entry
+
+    ranked = sorted(groups.items(), key=lambda item: sum(item[1]['durations']), reverse=True)[:top]
+    print(f"{'total ms':>10} {'veces':>6} {'prom ms':>9} {'máx ms':>9} {'planes':>6}  origen / SQL")
+    print("-" * 100)
+    for (origin, statement), group in ranked:
+        durations = group['durations']
+        print(f"{sum(durations):>10.1f} {len(durations):>6} {sum(durations) / len(durations):>9.1f} "
+              f"{max(durations):>9.1f} {group['plans']:>6}  {origin}")
+        print(f"{'':>45}{' '.join(statement.split())[:160]}")
+
+def show_tail(entries, count: int, plans: bool) -> None:
+    for entry in entries[-count:]:
+        print(f"🐢 {entry['timestamp']}  {entry['duration_ms']} ms  {entry.get('origin') or '?'}"
+              f"  {entry.get('request', '')}  (pid {entry.get('pid')})")
+        print(f"   {' '.join(entry['statement'].split())}")
+        print(f"   parámetros: {json.dumps(entry.get('parameters'), ensure_ascii=False)}")
+        if plans and 'plan' in entry:
+            print("   plan:")
+            for line in json.dumps(entry['plan'], indent=2, ensure_ascii=False).splitlines():
+                print(f"     {line}")
+        print()
+
+def main():
+    parser = argparse.ArgumentParser(description='Revisa el registro de consultas lentas')
+    parser.add_argument('--file', default=Config.SLOW_QUERY_LOG_FILE)
+    parser.add_argument('--since-minutes', type=float, help='Solo las entradas de los últimos N minutos')
+    parser.add_argument('--origin', help='Filtra por método de origen (subcadena)')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--tail', type=int, help='Muestra las últimas N entradas en lugar del resumen')
+    parser.add_argument('--plans', action='store_true', help='Con --tail, incluye los planes capturados')
+    args = parser.parse_args()
+
+    entries = read_slow_query_log(args.file)
+    if args.since_minutes is not None:
+        since = datetime.datetime.utcnow() - datetime.timedelta(minutes=args.since_minutes)
+        entries = [entry for entry in entries if parse_timestamp(entry['timestamp']) >= since]
+    if args.origin:
+        entries = [entry for entry in entries if args.origin in (entry.get('origin') or '')]
+
+    if not entries:
+        print(f"ℹ️  No hay consultas lentas registradas en {args.file}")
+        return
+
+    if args.tail:
+        show_tail(entries, args.tail, args.plans)
+    else:
+        summarize(entries, args.top)
+
+if __name__ == '__main__':
+    main()